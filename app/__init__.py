@@ -1,45 +1,78 @@
 # App module - UI controllers
 
 import sys
+from functools import lru_cache
 from pathlib import Path
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QIcon, QPixmap
 
 
-def get_base_path() -> Path:
-    """Get the base path for bundled resources (works both in dev and PyInstaller .exe)."""
-    if getattr(sys, "frozen", False):
-        return Path(sys._MEIPASS)
-    return Path(__file__).parent.parent
-
+# Base path for bundled resources (works both in dev and PyInstaller .exe),
+# resolved once at import
+if getattr(sys, "frozen", False):
+    BASE_PATH = Path(sys._MEIPASS)
+else:
+    BASE_PATH = Path(__file__).resolve().parent.parent
 
 # Icon folder at project root
-ICON_DIR = get_base_path() / "Icon"
+ICON_DIR = BASE_PATH / "Icon"
+
+# Window icon shared by every top-level window
+APP_ICON_FILE = "google drive icon.ico"
 
 
+@lru_cache(maxsize=32)
+def _load_pixmap(filename: str) -> QPixmap:
+    """Decode an image from the Icon/ folder once (null pixmap if missing)."""
+    icon_path = ICON_DIR / filename
+    if not icon_path.exists():
+        return QPixmap()
+    return QPixmap(str(icon_path))
+
+
+@lru_cache(maxsize=32)
 def load_icon(filename: str) -> QIcon:
     """
     Load an icon from the Icon/ folder, scaling large images down
     so they work as window icons.
 
+    Multi-resolution ``.ico`` files are handed to Qt as-is so it can pick
+    the embedded frame for each size; other images are rescaled here.
+    Results are cached, so repeated calls for the same file return the
+    same QIcon without touching disk or rescaling.
+
     Args:
         filename: Icon file name, e.g. "app.ico" or "app.png"
 
     Returns:
         QIcon (empty if file not found)
     """
-    icon_path = ICON_DIR / filename
-    if icon_path.exists():
-        pixmap = QPixmap(str(icon_path))
-        if not pixmap.isNull():
-            # Build a multi-size icon for best display at any DPI
-            icon = QIcon()
-            for size in (16, 32, 48, 64):
-                scaled = pixmap.scaled(
-                    size, size,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
-                icon.addPixmap(scaled)
-            return icon
+    if filename.lower().endswith(".ico"):
+        icon_path = ICON_DIR / filename
+        if icon_path.exists():
+            return QIcon(str(icon_path))
+        return QIcon()
+
+    pixmap = _load_pixmap(filename)
+    if not pixmap.isNull():
+        # Build a multi-size icon for best display at any DPI
+        icon = QIcon()
+        for size in (16, 32, 48, 64):
+            scaled = pixmap.scaled(
+                size, size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+            icon.addPixmap(scaled)
+        return icon
     return QIcon()
+
+
+def get_app_icon() -> QIcon:
+    """
+    Get the shared application window icon.
+
+    Built on first call (a QIcon can't be created before QApplication
+    exists) and reused by every window afterwards.
+    """
+    return load_icon(APP_ICON_FILE)
@@ -0,0 +1,121 @@
+"""Table model for scan results."""
+
+from typing import List, Dict, Any, Optional
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from infra.format_utils import format_size
+from core.classifier import classify_file
+
+
+class FilesModel(QAbstractTableModel):
+    """
+    Read-only model backing the scan results table.
+
+    Columns: File Name | Size | Type | Date
+
+    Display values are derived once per file when files are set, and
+    Qt pulls them lazily for the visible cells only.
+    """
+
+    HEADERS = ("File Name", "Size", "Type", "Date")
+
+    COL_NAME = 0
+    COL_SIZE = 1
+    COL_TYPE = 2
+    COL_DATE = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._files: List[Dict[str, Any]] = []
+        self._names: List[str] = []
+        self._sizes: List[int] = []
+        self._categories: List[str] = []
+        self._dates: List[str] = []
+
+    def setFiles(self, files: List[Dict[str, Any]]) -> None:
+        """Replace all rows with the given file metadata dictionaries."""
+        self.beginResetModel()
+        self._files = list(files)
+        self._names = []
+        self._sizes = []
+        self._categories = []
+        self._dates = []
+        self._append_columns(self._files)
+        self.endResetModel()
+
+    def appendFiles(self, files: List[Dict[str, Any]]) -> None:
+        """Append rows for the given file metadata dictionaries."""
+        if not files:
+            return
+
+        first = len(self._files)
+        self.beginInsertRows(QModelIndex(), first, first + len(files) - 1)
+        self._files.extend(files)
+        self._append_columns(files)
+        self.endInsertRows()
+
+    def files(self) -> List[Dict[str, Any]]:
+        """Get the file metadata dictionaries, in row order."""
+        return self._files
+
+    def _append_columns(self, files: List[Dict[str, Any]]) -> None:
+        """Precompute the display columns for the given files."""
+        for file_data in files:
+            name = file_data.get("name", "")
+            self._names.append(name)
+            # The scan worker stores size as int and precomputes the category
+            self._sizes.append(file_data.get("size", 0))
+            category = file_data.get("_category")
+            if category is None:
+                category = classify_file(name, file_data.get("mimeType", ""))
+            self._categories.append(category)
+
+            # modifiedTime is RFC 3339, so its first 10 characters are YYYY-MM-DD
+            date_str = file_data.get("modifiedTime", "")
+            self._dates.append(date_str[:10] if isinstance(date_str, str) else "")
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._files)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Optional[Any]:
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.COL_NAME:
+                return self._names[row]
+            if column == self.COL_SIZE:
+                return format_size(self._sizes[row])
+            if column == self.COL_TYPE:
+                return self._categories[row]
+            if column == self.COL_DATE:
+                return self._dates[row]
+
+        elif role == Qt.ItemDataRole.UserRole:
+            # Raw values, so callers never have to parse display strings
+            if column == self.COL_SIZE:
+                return self._sizes[row]
+            return self._files[row].get("id", "")
+
+        return None
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole
+    ) -> Optional[Any]:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
@@ -1,23 +1,27 @@
 """Main window controller."""
 
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 
 from PySide6.QtCore import Slot, QThreadPool
 from PySide6.QtWidgets import (
-    QMainWindow, QWidget, QMessageBox, QTableWidgetItem,
+    QMainWindow, QWidget, QMessageBox, QAbstractItemView,
     QHeaderView, QVBoxLayout, QHBoxLayout, QGroupBox,
-    QFormLayout, QLabel, QPushButton, QTableWidget, QStatusBar
+    QFormLayout, QLabel, QPushButton, QTableView, QStatusBar, QProgressBar
 )
 
-from app import load_icon
+from app import get_app_icon
+from app.files_model import FilesModel
 from storage.config import Config
-from core.planner import format_size
-from core.classifier import classify_file
-from core.organizer import parse_drive_date
-from workers.scan_worker import ScanWorker
-from workers.archive_worker import ArchiveWorker
-from app.settings_dialog import SettingsDialog
+from storage.scan_cache import ScanCache
+from core.planner import total_size_from_raw
+from infra.format_utils import format_size
+
+# Workers and the settings dialog pull in the Google API client, so they are
+# imported on first use to keep them off the startup path.
+if TYPE_CHECKING:
+    from workers.scan_worker import ScanWorker
+    from workers.archive_worker import ArchiveWorker
 
 
 class MainWindow(QMainWindow):
@@ -30,20 +34,25 @@ class MainWindow(QMainWindow):
     def __init__(self, config: Config, parent=None):
         super().__init__(parent)
         self.config = config
-        self._files: List[Dict[str, Any]] = []
-        self._scan_worker: Optional[ScanWorker] = None
-        self._archive_worker: Optional[ArchiveWorker] = None
-        self._thread_pool = QThreadPool()
+        self._scan_worker: Optional["ScanWorker"] = None
+        self._archive_worker: Optional["ArchiveWorker"] = None
+        # Shared pool: its threads stay warm across scans and archives
+        self._thread_pool = QThreadPool.globalInstance()
+        self._scan_cache = ScanCache()
+        self._showing_cached = False
+        self._closing = False
+        self._displayed_settings: Dict[QLabel, str] = {}
 
         self._setup_ui()
         self._try_refresh_email()
         self._refresh_settings_display()
         self._connect_signals()
+        self._show_cached_scan()
 
     def _setup_ui(self) -> None:
         """Build the main window UI."""
         self.setWindowTitle("Drive Archiver")
-        self.setWindowIcon(load_icon("google drive icon.png"))
+        self.setWindowIcon(get_app_icon())
         self.resize(600, 523)
 
         central_widget = QWidget()
@@ -94,12 +103,12 @@ class MainWindow(QMainWindow):
         summary_layout.addWidget(self.lblSpaceToFree)
 
         # Files table
-        self.tblFiles = QTableWidget()
-        self.tblFiles.setColumnCount(4)
-        self.tblFiles.setHorizontalHeaderLabels(["File Name", "Size", "Type", "Date"])
-        self.tblFiles.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.tblFiles.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.tblFiles.setSelectionMode(QTableWidget.SelectionMode.ExtendedSelection)
+        self._model = FilesModel(self)
+        self.tblFiles = QTableView()
+        self.tblFiles.setModel(self._model)
+        self.tblFiles.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tblFiles.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tblFiles.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
 
         header = self.tblFiles.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
@@ -125,6 +134,15 @@ class MainWindow(QMainWindow):
         self.statusBar = QStatusBar()
         self.setStatusBar(self.statusBar)
 
+        # Bytes downloaded over the whole archive run, shown while it runs.
+        # Byte counts overflow a QProgressBar's int range, so it shows
+        # tenths of a percent.
+        self.progressArchive = QProgressBar()
+        self.progressArchive.setRange(0, 1000)
+        self.progressArchive.setMaximumWidth(200)
+        self.progressArchive.setVisible(False)
+        self.statusBar.addPermanentWidget(self.progressArchive)
+
     def _connect_signals(self) -> None:
         """Connect UI signals to handlers."""
         self.btnOpenSettings.clicked.connect(self._on_settings_clicked)
@@ -133,57 +151,136 @@ class MainWindow(QMainWindow):
         self.btnArchiveSelected.clicked.connect(self._on_archive_selected_clicked)
 
     def _try_refresh_email(self) -> None:
-        """Refresh account email from Google if it's missing or unknown."""
+        """
+        Refresh the token in the background, and the account email if it's missing or unknown.
+
+        The email is cached in the config, so later launches skip the
+        Drive about() call.
+        """
         email = self.config.account_email
-        if email and email not in ("", "Unknown"):
+        fetch_email = not email or email == "Unknown"
+
+        from workers.email_worker import EmailRefreshWorker
+
+        worker = EmailRefreshWorker(fetch_email=fetch_email)
+        worker.signals.fetched.connect(self._on_email_fetched)
+        worker.signals.auth_failed.connect(self._on_auth_failed)
+        self._thread_pool.start(worker)
+
+    @Slot(str)
+    def _on_email_fetched(self, email: str) -> None:
+        """Store the account email fetched by the background worker."""
+        self.config.account_email = email
+        self.config.save()
+        self._refresh_settings_display()
+
+    @Slot(str)
+    def _on_auth_failed(self, error: str) -> None:
+        """
+        Send the user back through onboarding when the saved sign-in is rejected.
+
+        Startup only checks that a token is saved, so a revoked or expired
+        one is first noticed by the background refresh.
+        """
+        if self._closing:
+            return
+
+        QMessageBox.warning(
+            self,
+            "Sign-in Required",
+            f"{error}\n\nPlease connect your Google account again."
+        )
+
+        from app.onboarding_wizard import OnboardingWizard
+
+        wizard = OnboardingWizard(self.config, self)
+        if wizard.exec() != wizard.DialogCode.Accepted:
+            # Without a working sign-in nothing in the window can work
+            self.close()
             return
-        try:
-            from infra.auth import get_credentials, get_user_email
-            creds = get_credentials()
-            if creds:
-                fetched = get_user_email(creds)
-                if fetched and fetched != "Unknown":
-                    self.config.account_email = fetched
-                    self.config.save()
-        except Exception:
-            pass
+
+        self.config.load()
+        self._refresh_settings_display()
+        if not self._show_cached_scan():
+            self._clear_table()
 
     def _refresh_settings_display(self) -> None:
         """Update the settings display with current config values."""
-        self.lblAccountEmail.setText(self.config.account_email or "Not connected")
-        self.lblArchiveFolder.setText(self.config.archive_path or "Not set")
         if self.config.filter_mode == "date":
-            self.lblFilter.setText(f"Modified before {self.config.before_date}")
+            filter_text = f"Modified before {self.config.before_date}"
         else:
-            self.lblFilter.setText(f"File size >= {self.config.min_size_mb} MB")
-        self.lblDryRun.setText("On" if self.config.dry_run else "Off")
-        self.lblTrashAfter.setText("On" if self.config.trash_after else "Off")
+            filter_text = f"File size >= {self.config.min_size_mb} MB"
+
+        texts = {
+            self.lblAccountEmail: self.config.account_email or "Not connected",
+            self.lblArchiveFolder: self.config.archive_path or "Not set",
+            self.lblFilter: filter_text,
+            self.lblDryRun: "On" if self.config.dry_run else "Off",
+            self.lblTrashAfter: "On" if self.config.trash_after else "Off",
+        }
+
+        # Only touch labels whose text changed (setText invalidates the layout)
+        for label, text in texts.items():
+            if self._displayed_settings.get(label) != text:
+                label.setText(text)
+                self._displayed_settings[label] = text
 
     @Slot()
     def _on_settings_clicked(self) -> None:
         """Open settings dialog."""
+        from app.settings_dialog import SettingsDialog
+
         dialog = SettingsDialog(self.config, self)
         if dialog.exec():
             # Refresh display after settings change
             self._refresh_settings_display()
 
+    def _scan_cache_key(self) -> list:
+        """Get the key identifying scan results for the current account and rules."""
+        return [
+            self.config.account_email,
+            self.config.filter_mode,
+            self.config.min_size_mb,
+            self.config.before_date,
+        ]
+
+    def _show_cached_scan(self) -> bool:
+        """Show the last scan results for the current settings, if cached."""
+        files = self._scan_cache.load(self._scan_cache_key())
+        if files is None:
+            return False
+
+        self._populate_table(files)
+        self._showing_cached = True
+
+        total_size = total_size_from_raw(files)
+        self.lblFilesFound.setText(f"Files found: {len(files)}")
+        self.lblSpaceToFree.setText(f"Estimated space to free: {format_size(total_size)}")
+        self._update_status(f"Showing {len(files)} files from last scan")
+        return True
+
     @Slot()
     def _on_scan_clicked(self) -> None:
         """Start scanning Google Drive."""
         if self._scan_worker is not None:
             return  # Already scanning
 
-        self._files = []
-        self._clear_table()
+        # Show cached results right away; the scan below replaces them
+        if not self._show_cached_scan():
+            self._clear_table()
         self._update_status("Scanning...")
         self._set_buttons_enabled(False)
 
+        from workers.scan_worker import ScanWorker
+
         if self.config.filter_mode == "date":
             self._scan_worker = ScanWorker(min_size_mb=0, before_date=self.config.before_date)
         else:
             self._scan_worker = ScanWorker(min_size_mb=self.config.min_size_mb, before_date="")
         self._scan_worker.signals.progress.connect(self._on_scan_progress)
+        self._scan_worker.signals.batch.connect(self._on_scan_batch)
         self._scan_worker.signals.finished.connect(self._on_scan_finished)
+        self._scan_worker.signals.cancelled.connect(self._on_scan_cancelled)
         self._scan_worker.signals.error.connect(self._on_scan_error)
         self._scan_worker.signals.status.connect(self._update_status)
 
@@ -195,24 +292,47 @@ class MainWindow(QMainWindow):
         self._update_status(f"Scanning... found {count} files")
 
     @Slot(list)
-    def _on_scan_finished(self, files: List[Dict[str, Any]]) -> None:
+    def _on_scan_batch(self, files: List[Dict[str, Any]]) -> None:
+        """Show a batch of scan results while the scan is still running."""
+        if self._showing_cached:
+            # Fresh results are arriving; drop the cached rows
+            self._model.setFiles([])
+            self._showing_cached = False
+        self._model.appendFiles(files)
+
+    @Slot(list, "qint64", int)
+    def _on_scan_finished(self, files: List[Dict[str, Any]], total_size: int, count: int) -> None:
         """Handle scan completion."""
         self._scan_worker = None
-        self._files = files
-        self._populate_table(files)
+        if self._finish_closing():
+            return
+        # Rows were already added batch by batch; only resync if they differ
+        if self._showing_cached or self._model.rowCount() != count:
+            self._populate_table(files)
+        self._showing_cached = False
+        self._scan_cache.save(self._scan_cache_key(), files)
         self._set_buttons_enabled(True)
 
-        # Update summary
-        total_size = sum(int(f.get("size", 0)) for f in files)
-        self.lblFilesFound.setText(f"Files found: {len(files)}")
+        # Update summary (totals are computed by the worker)
+        self.lblFilesFound.setText(f"Files found: {count}")
         self.lblSpaceToFree.setText(f"Estimated space to free: {format_size(total_size)}")
 
-        self._update_status(f"Scan complete - {len(files)} files found")
+        self._update_status(f"Scan complete - {count} files found")
+
+    @Slot()
+    def _on_scan_cancelled(self) -> None:
+        """Handle scan cancellation."""
+        self._scan_worker = None
+        if self._finish_closing():
+            return
+        self._set_buttons_enabled(True)
 
     @Slot(str)
     def _on_scan_error(self, error: str) -> None:
         """Handle scan error."""
         self._scan_worker = None
+        if self._finish_closing():
+            return
         self._set_buttons_enabled(True)
         self._update_status("Scan failed")
 
@@ -220,56 +340,39 @@ class MainWindow(QMainWindow):
 
     def _populate_table(self, files: List[Dict[str, Any]]) -> None:
         """Populate the files table with scan results."""
-        self.tblFiles.setRowCount(len(files))
-
-        for row, file_data in enumerate(files):
-            # File name
-            name = file_data.get("name", "")
-            self.tblFiles.setItem(row, 0, QTableWidgetItem(name))
-
-            # Size
-            size = int(file_data.get("size", 0))
-            self.tblFiles.setItem(row, 1, QTableWidgetItem(format_size(size)))
-
-            # Type (category)
-            mime_type = file_data.get("mimeType", "")
-            category = classify_file(name, mime_type)
-            self.tblFiles.setItem(row, 2, QTableWidgetItem(category))
-
-            # Date
-            date_str = file_data.get("modifiedTime", "")
-            date = parse_drive_date(date_str)
-            if date:
-                formatted_date = date.strftime("%Y-%m-%d")
-            else:
-                formatted_date = ""
-            self.tblFiles.setItem(row, 3, QTableWidgetItem(formatted_date))
+        self._model.setFiles(files)
 
     def _clear_table(self) -> None:
         """Clear the files table."""
-        self.tblFiles.setRowCount(0)
+        self._model.setFiles([])
         self.lblFilesFound.setText("Files found: 0")
         self.lblSpaceToFree.setText("Estimated space to free: 0 MB")
 
     @Slot()
     def _on_archive_all_clicked(self) -> None:
         """Archive all files in the table."""
-        if not self._files:
+        # The model is the source of truth: it also holds rows streamed in
+        # by a scan that was later cancelled or failed
+        files = self._model.files()
+        if not files:
             QMessageBox.information(self, "No Files", "No files to archive. Run a scan first.")
             return
 
-        self._start_archive(self._files)
+        self._start_archive(list(files))
 
     @Slot()
     def _on_archive_selected_clicked(self) -> None:
         """Archive selected files only."""
-        selected_rows = set(index.row() for index in self.tblFiles.selectedIndexes())
+        # selectedRows() yields one index per fully selected row, so no dedupe is needed
+        selected_rows = [index.row() for index in self.tblFiles.selectionModel().selectedRows()]
 
         if not selected_rows:
             QMessageBox.information(self, "No Selection", "Please select files to archive.")
             return
 
-        selected_files = [self._files[row] for row in sorted(selected_rows)]
+        selected_rows.sort()
+        files = self._model.files()
+        selected_files = [files[row] for row in selected_rows]
         self._start_archive(selected_files)
 
     def _start_archive(self, files: List[Dict[str, Any]]) -> None:
@@ -296,6 +399,8 @@ class MainWindow(QMainWindow):
         self._set_buttons_enabled(False)
         self._update_status("Archiving...")
 
+        from workers.archive_worker import ArchiveWorker
+
         self._archive_worker = ArchiveWorker(
             files=files,
             archive_path=self.config.archive_path,
@@ -305,8 +410,12 @@ class MainWindow(QMainWindow):
         self._archive_worker.signals.progress.connect(self._on_archive_progress)
         self._archive_worker.signals.finished.connect(self._on_archive_finished)
         self._archive_worker.signals.error.connect(self._on_archive_error)
+        self._archive_worker.signals.bytes_progress.connect(self._on_archive_bytes)
         self._archive_worker.signals.status.connect(self._update_status)
 
+        self.progressArchive.setValue(0)
+        self.progressArchive.setVisible(not self.config.dry_run)
+
         self._thread_pool.start(self._archive_worker)
 
     @Slot(int, int, str)
@@ -314,12 +423,26 @@ class MainWindow(QMainWindow):
         """Handle archive progress update."""
         self._update_status(f"Archiving {current}/{total}: {filename}")
 
+    @Slot("qint64", "qint64")
+    def _on_archive_bytes(self, downloaded: int, total: int) -> None:
+        """Show how much of the archive run has been downloaded."""
+        if total > 0:
+            self.progressArchive.setValue(min(1000, downloaded * 1000 // total))
+
     @Slot(int, int)
     def _on_archive_finished(self, success: int, failed: int) -> None:
         """Handle archive completion."""
         self._archive_worker = None
+        self.progressArchive.setVisible(False)
         self._set_buttons_enabled(True)
 
+        # Trashed files are gone from Drive, so the cached scan is stale
+        if not self.config.dry_run and self.config.trash_after and success > 0:
+            self._scan_cache.clear()
+
+        if self._finish_closing():
+            return
+
         mode = "Dry run" if self.config.dry_run else "Archive"
         message = f"{mode} complete: {success} succeeded"
         if failed > 0:
@@ -333,6 +456,9 @@ class MainWindow(QMainWindow):
     def _on_archive_error(self, error: str) -> None:
         """Handle archive error."""
         self._archive_worker = None
+        self.progressArchive.setVisible(False)
+        if self._finish_closing():
+            return
         self._set_buttons_enabled(True)
         self._update_status("Archive failed")
 
@@ -348,12 +474,36 @@ class MainWindow(QMainWindow):
         """Update the status bar message."""
         self.statusBar.showMessage(message)
 
+    def _finish_closing(self) -> bool:
+        """
+        Close the window once the last worker has stopped, if a close is pending.
+
+        Returns:
+            True if a close is pending (callers should skip further UI updates)
+        """
+        if not self._closing:
+            return False
+        if self._scan_worker is None and self._archive_worker is None:
+            self.close()
+        return True
+
     def closeEvent(self, event) -> None:
-        """Handle window close - cancel any running workers."""
+        """Handle window close - cancel any running workers and close once they stop."""
+        if self._scan_worker is None and self._archive_worker is None:
+            event.accept()
+            return
+
+        if self._closing:
+            # Second close request - don't keep waiting on the workers
+            self._thread_pool.waitForDone(3000)
+            event.accept()
+            return
+
+        self._closing = True
         if self._scan_worker:
             self._scan_worker.cancel()
         if self._archive_worker:
             self._archive_worker.cancel()
 
-        self._thread_pool.waitForDone(3000)
-        event.accept()
+        self._update_status("Stopping background tasks...")
+        event.ignore()
@@ -2,14 +2,18 @@
 
 from pathlib import Path
 
-from PySide6.QtCore import Slot, QFile, QIODevice
-from PySide6.QtWidgets import QWizard, QWizardPage, QFileDialog, QMessageBox
-from PySide6.QtUiTools import QUiLoader
-
-from app import load_icon
+from PySide6.QtCore import Slot, QDate
+from PySide6.QtWidgets import (
+    QWizard, QWizardPage, QFileDialog, QMessageBox, QVBoxLayout,
+    QHBoxLayout, QLabel, QCheckBox, QGroupBox, QPushButton, QLineEdit,
+    QSpinBox, QDateEdit, QRadioButton
+)
+
+from app import get_app_icon
 from storage.config import Config
 from infra.auth import authenticate, CredentialsMissingError, AuthError
-from infra.filesystem import get_disk_free_space, format_size
+from infra.filesystem import get_disk_free_space
+from infra.format_utils import format_size
 
 
 class OnboardingWizard(QWizard):
@@ -35,46 +39,26 @@ class OnboardingWizard(QWizard):
         self._account_email = ""
         self._archive_path = ""
 
-        self.setWindowIcon(load_icon("google drive icon.png"))
+        self.setWindowIcon(get_app_icon())
         self._load_ui()
         self._connect_signals()
 
     def _load_ui(self) -> None:
-        """Load the wizard from UI file and extract pages."""
-        loader = QUiLoader()
-        ui_path = Path(__file__).parent.parent / "wizard_onboarding.ui"
-
-        ui_file = QFile(str(ui_path))
-        if not ui_file.open(QIODevice.OpenModeFlag.ReadOnly):
-            raise RuntimeError(f"Cannot open UI file: {ui_path}")
-
-        loaded_wizard = loader.load(ui_file, None)
-        ui_file.close()
-
-        if not loaded_wizard:
-            raise RuntimeError("Failed to load wizard UI")
-
-        # Set up this wizard with properties from loaded
-        self.setWindowTitle(loaded_wizard.windowTitle())
+        """Set up the wizard window and build its pages."""
+        # Pages are built in code; wizard_onboarding.ui is kept as the design
+        # reference only, so it isn't parsed at runtime.
+        self.setWindowTitle("Drive Archive Setup")
         self.setWizardStyle(QWizard.WizardStyle.ModernStyle)
 
-        # Create pages manually since we can't directly transfer QWizardPages
-        self._create_pages(loaded_wizard)
+        self._create_pages()
 
-    def _create_pages(self, loaded: QWizard) -> None:
-        """Create wizard pages based on the loaded UI."""
+    def _create_pages(self) -> None:
+        """Create wizard pages (mirrors the layout in wizard_onboarding.ui)."""
         # Page 0: Welcome
         page_welcome = QWizardPage()
         page_welcome.setTitle("Welcome")
         page_welcome.setSubTitle("Google Drive Archive & Cleanup Tool")
 
-        # Find widgets from loaded wizard
-        loaded_page = loaded.page(0)
-        if loaded_page:
-            self.chkUnderstandTrash = loaded_page.findChild(loaded_page.__class__.mro()[1], "chkUnderstandTrash")
-
-        from PySide6.QtWidgets import QVBoxLayout, QLabel, QCheckBox
-
         layout = QVBoxLayout()
         label = QLabel(
             "<p style='font-size: 11pt;'>This tool scans Google Drive for large files.</p>"
@@ -96,8 +80,6 @@ class OnboardingWizard(QWizard):
         page_connect.setTitle("Connect")
         page_connect.setSubTitle("Connect your Google Drive account")
 
-        from PySide6.QtWidgets import QGroupBox, QPushButton
-
         layout = QVBoxLayout()
         group = QGroupBox("Google Drive Account")
         group_layout = QVBoxLayout()
@@ -120,8 +102,6 @@ class OnboardingWizard(QWizard):
         page_archive.setTitle("Archive Folder")
         page_archive.setSubTitle("Choose where to save archived files")
 
-        from PySide6.QtWidgets import QLineEdit
-
         layout = QVBoxLayout()
 
         self.txtArchiveFolder = QLineEdit()
@@ -144,9 +124,6 @@ class OnboardingWizard(QWizard):
         page_rules.setTitle("Rules")
         page_rules.setSubTitle("Configure archive rules")
 
-        from PySide6.QtCore import QDate
-        from PySide6.QtWidgets import QSpinBox, QHBoxLayout, QDateEdit, QRadioButton
-
         layout = QVBoxLayout()
 
         # Filter mode radio buttons
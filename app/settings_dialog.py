@@ -9,7 +9,7 @@ from PySide6.QtWidgets import (
     QLabel, QDialogButtonBox, QDateEdit, QHBoxLayout, QRadioButton
 )
 
-from app import load_icon
+from app import get_app_icon
 from storage.config import Config
 
 
@@ -35,7 +35,7 @@ class SettingsDialog(QDialog):
     def _setup_ui(self) -> None:
         """Build the dialog UI programmatically."""
         self.setWindowTitle("Settings")
-        self.setWindowIcon(load_icon("google drive icon.png"))
+        self.setWindowIcon(get_app_icon())
         self.setMinimumSize(520, 280)
         self.setModal(True)
 
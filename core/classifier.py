@@ -1,24 +1,27 @@
 """File type classification based on extension and MIME type."""
 
-from pathlib import Path
+from functools import lru_cache
 from typing import Optional
 
 
-# Category definitions with file extensions
-CATEGORIES = {
-    "Photos": {"jpg", "jpeg", "png", "heic", "webp", "gif", "bmp", "tiff", "tif", "raw", "cr2", "nef"},
-    "Videos": {"mp4", "mkv", "mov", "avi", "webm", "wmv", "flv", "m4v", "3gp"},
-    "Audio": {"mp3", "wav", "flac", "m4a", "aac", "ogg", "wma", "aiff"},
-    "Documents": {"pdf", "docx", "doc", "xlsx", "xls", "pptx", "ppt", "txt", "rtf", "odt", "ods", "odp"},
-    "Archives": {"zip", "rar", "7z", "tar", "gz", "bz2", "xz", "tgz"},
-    "Installers": {"exe", "msi", "dmg", "pkg", "deb", "rpm", "appimage"},
+# Extension to category lookup (authoritative; CATEGORIES is derived from it)
+EXTENSION_TO_CATEGORY = {
+    "jpg": "Photos", "jpeg": "Photos", "png": "Photos", "heic": "Photos", "webp": "Photos",
+    "gif": "Photos", "bmp": "Photos", "tiff": "Photos", "tif": "Photos", "raw": "Photos",
+    "cr2": "Photos", "nef": "Photos",
+    "mp4": "Videos", "mkv": "Videos", "mov": "Videos", "avi": "Videos", "webm": "Videos",
+    "wmv": "Videos", "flv": "Videos", "m4v": "Videos", "3gp": "Videos",
+    "mp3": "Audio", "wav": "Audio", "flac": "Audio", "m4a": "Audio", "aac": "Audio", "ogg": "Audio",
+    "wma": "Audio", "aiff": "Audio",
+    "pdf": "Documents", "docx": "Documents", "doc": "Documents", "xlsx": "Documents",
+    "xls": "Documents", "pptx": "Documents", "ppt": "Documents", "txt": "Documents",
+    "rtf": "Documents", "odt": "Documents", "ods": "Documents", "odp": "Documents",
+    "zip": "Archives", "rar": "Archives", "7z": "Archives", "tar": "Archives", "gz": "Archives",
+    "bz2": "Archives", "xz": "Archives", "tgz": "Archives",
+    "exe": "Installers", "msi": "Installers", "dmg": "Installers", "pkg": "Installers",
+    "deb": "Installers", "rpm": "Installers", "appimage": "Installers",
 }
 
-# Build reverse lookup from extension to category
-EXTENSION_TO_CATEGORY = {}
-for category, extensions in CATEGORIES.items():
-    for ext in extensions:
-        EXTENSION_TO_CATEGORY[ext.lower()] = category
 
 # MIME type to category mapping (for cases where extension is ambiguous)
 MIME_TO_CATEGORY = {
@@ -80,16 +83,13 @@ MIME_TO_CATEGORY = {
 }
 
 
-def classify_file(filename: str, mime_type: Optional[str] = None) -> str:
+@lru_cache(maxsize=512)
+def _classify(ext: str, mime_type: str) -> str:
     """
-    Classify a file into a category based on its extension and MIME type.
+    Classify by lowercased extension and MIME type.
 
-    Args:
-        filename: The file name (with extension)
-        mime_type: Optional MIME type for more accurate classification
-
-    Returns:
-        Category name (Photos, Videos, Audio, Documents, Archives, Installers, or Other)
+    Cached, since Drive archives repeat the same extension/MIME pairs
+    across thousands of files.
     """
     # First try MIME type if provided
     if mime_type:
@@ -98,7 +98,6 @@ def classify_file(filename: str, mime_type: Optional[str] = None) -> str:
             return category
 
     # Fall back to extension
-    ext = Path(filename).suffix.lower().lstrip(".")
     if ext:
         category = EXTENSION_TO_CATEGORY.get(ext)
         if category:
@@ -107,6 +106,23 @@ def classify_file(filename: str, mime_type: Optional[str] = None) -> str:
     return "Other"
 
 
+def classify_file(filename: str, mime_type: Optional[str] = None) -> str:
+    """
+    Classify a file into a category based on its extension and MIME type.
+
+    Args:
+        filename: The file name (with extension)
+        mime_type: Optional MIME type for more accurate classification
+
+    Returns:
+        Category name (Photos, Videos, Audio, Documents, Archives, Installers, or Other)
+    """
+    # A leading dot alone, as in ".bashrc", is not an extension
+    idx = filename.rfind(".")
+    ext = filename[idx + 1:].lower() if idx > 0 else ""
+    return _classify(ext, mime_type or "")
+
+
 def get_category_icon(category: str) -> str:
     """Get an emoji icon for a category."""
     icons = {
@@ -123,4 +139,22 @@ def get_category_icon(category: str) -> str:
 
 def get_all_categories() -> list:
     """Get list of all category names."""
-    return list(CATEGORIES.keys()) + ["Other"]
+    # dict.fromkeys keeps first-seen order without building CATEGORIES
+    return list(dict.fromkeys(EXTENSION_TO_CATEGORY.values())) + ["Other"]
+
+
+def _group_categories() -> dict:
+    """Group EXTENSION_TO_CATEGORY into {category: set of extensions}."""
+    categories: dict = {}
+    for ext, category in EXTENSION_TO_CATEGORY.items():
+        categories.setdefault(category, set()).add(ext)
+    return categories
+
+
+def __getattr__(name: str):
+    # CATEGORIES is built on first access rather than at import time
+    if name == "CATEGORIES":
+        categories = _group_categories()
+        globals()["CATEGORIES"] = categories
+        return categories
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,9 @@
 """Local folder organization for archived files."""
 
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional, Set
 
 from core.classifier import classify_file
 
@@ -11,6 +12,12 @@ from core.classifier import classify_file
 DATE_ORGANIZED_CATEGORIES = {"Photos", "Videos", "Documents"}
 
 
+@lru_cache(maxsize=1024)
+def _dated_folder(archive_root: str, category: str, year: int, month: int) -> Path:
+    """Build (and cache) the Category/YYYY/YYYY-MM folder shared by many files."""
+    return Path(archive_root) / category / str(year) / f"{year}-{month:02d}"
+
+
 def get_local_path(
     archive_root: Path,
     filename: str,
@@ -41,32 +48,70 @@ def get_local_path(
     category = classify_file(filename, mime_type)
 
     if category in DATE_ORGANIZED_CATEGORIES and modified_date:
-        year = str(modified_date.year)
-        month = f"{modified_date.year}-{modified_date.month:02d}"
-        return archive_root / category / year / month / filename
+        parent = _dated_folder(str(archive_root), category, modified_date.year, modified_date.month)
+        return parent / filename
     else:
         return archive_root / category / filename
 
 
+def ensure_structure(local_paths: Iterable[Path]) -> Set[Path]:
+    """
+    Create the folders for a set of planned archive paths up front.
+
+    Many files share a Category/YYYY/YYYY-MM folder, so each unique folder
+    is created once instead of once per downloaded file.
+
+    Args:
+        local_paths: Planned file paths (as returned by get_local_path)
+
+    Returns:
+        The set of folders that now exist
+    """
+    folders = {path.parent for path in local_paths}
+    for folder in folders:
+        folder.mkdir(parents=True, exist_ok=True)
+    return folders
+
+
+@lru_cache(maxsize=8192)
 def parse_drive_date(date_str: str) -> Optional[datetime]:
     """
     Parse a date string from Google Drive API.
 
     Drive API returns dates in RFC 3339 format: 2024-01-15T10:30:00.000Z
+
+    The format has fixed field offsets, so it is sliced directly rather than
+    going through strptime. Results are cached, since the same timestamps
+    recur across a scan.
     """
     if not date_str:
         return None
 
-    try:
-        # Remove the 'Z' suffix and parse
-        if date_str.endswith("Z"):
-            date_str = date_str[:-1]
+    # Remove the 'Z' suffix
+    if date_str.endswith("Z"):
+        date_str = date_str[:-1]
+
+    if (
+        len(date_str) < 19
+        or date_str[4] != "-" or date_str[7] != "-" or date_str[10] != "T"
+        or date_str[13] != ":" or date_str[16] != ":"
+    ):
+        return None
 
+    try:
         # Handle microseconds if present
-        if "." in date_str:
-            return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S.%f")
-        else:
-            return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S")
+        microsecond = 0
+        if len(date_str) > 19:
+            fraction = date_str[20:]
+            if date_str[19] != "." or not fraction.isdigit() or len(fraction) > 6:
+                return None
+            microsecond = int(fraction.ljust(6, "0"))
+
+        return datetime(
+            int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+            int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19]),
+            microsecond
+        )
     except ValueError:
         return None
 
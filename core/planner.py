@@ -1,11 +1,17 @@
 """File eligibility rules and filtering."""
 
-from typing import List, Dict, Any, Optional
+import sys
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 
 
 class FileInfo:
     """Represents a Drive file with its metadata."""
 
+    # Scans build one per eligible file; slots avoid a __dict__ for each
+    __slots__ = (
+        "id", "name", "size", "mime_type", "modified_time", "parents", "md5_checksum", "_raw"
+    )
+
     def __init__(self, data: Dict[str, Any]):
         self.id: str = data.get("id", "")
         self.name: str = data.get("name", "")
@@ -13,6 +19,7 @@ class FileInfo:
         self.mime_type: str = data.get("mimeType", "")
         self.modified_time: str = data.get("modifiedTime", "")
         self.parents: List[str] = data.get("parents", [])
+        self.md5_checksum: str = data.get("md5Checksum", "")
         self._raw = data
 
     @property
@@ -25,22 +32,32 @@ class FileInfo:
         return self._raw
 
 
+# MIME type strings below are interned so lookups against the (also
+# interned) mimeType values from the Drive listing hit the identity fast path.
+
 # MIME types for Google Docs (these have size=0 in API but may export large)
-GOOGLE_DOC_TYPES = {
+GOOGLE_DOC_TYPES = {sys.intern(m) for m in {
     "application/vnd.google-apps.document",
     "application/vnd.google-apps.spreadsheet",
     "application/vnd.google-apps.presentation",
     "application/vnd.google-apps.drawing",
-}
+}}
 
 # MIME types to skip (shortcuts, forms, etc.)
-SKIP_MIME_TYPES = {
+SKIP_MIME_TYPES = {sys.intern(m) for m in {
     "application/vnd.google-apps.shortcut",
     "application/vnd.google-apps.form",
     "application/vnd.google-apps.map",
     "application/vnd.google-apps.site",
     "application/vnd.google-apps.folder",
-}
+}}
+
+# How each known MIME type is treated, so eligibility needs one lookup
+MIME_SKIP = 0
+MIME_GOOGLE_DOC = 1
+MIME_REGULAR = 2
+
+MIME_CLASS = {m: MIME_SKIP for m in SKIP_MIME_TYPES} | {m: MIME_GOOGLE_DOC for m in GOOGLE_DOC_TYPES}
 
 
 def is_eligible_file(
@@ -67,8 +84,10 @@ def is_eligible_file(
     Returns:
         True if file is eligible for archiving
     """
+    mime_class = MIME_CLASS.get(file_info.mime_type, MIME_REGULAR)
+
     # Skip folders and special types
-    if file_info.mime_type in SKIP_MIME_TYPES:
+    if mime_class == MIME_SKIP:
         return False
 
     # Check date filter (modifiedTime is ISO format from Drive API)
@@ -77,7 +96,7 @@ def is_eligible_file(
             return False
 
     # Handle Google Docs types
-    if file_info.mime_type in GOOGLE_DOC_TYPES:
+    if mime_class == MIME_GOOGLE_DOC:
         # Google Docs have size=0 in API, include if enabled
         return include_google_docs
 
@@ -86,31 +105,48 @@ def is_eligible_file(
 
 
 def filter_eligible_files(
-    files: List[Dict[str, Any]],
+    files: Iterable[Dict[str, Any]],
     min_size_mb: int,
     before_date: str = "",
     include_google_docs: bool = True
-) -> List[FileInfo]:
+) -> Iterator[FileInfo]:
     """
-    Filter a list of files to only those eligible for archiving.
+    Filter files to only those eligible for archiving.
+
+    Files are consumed and yielded lazily, so a Drive listing can be
+    filtered as it streams in; wrap in list() if a list is needed.
 
     Args:
-        files: List of file metadata dictionaries from Drive API
+        files: File metadata dictionaries from Drive API
         min_size_mb: Minimum size threshold in MB
         before_date: Only include files modified before this date (YYYY-MM-DD), empty to skip
         include_google_docs: Whether to include Google Docs files
 
-    Returns:
-        List of eligible FileInfo objects
+    Yields:
+        Eligible FileInfo objects
     """
-    eligible = []
+    # Same rules as is_eligible_file, applied to the raw dicts so rejected
+    # files never get a FileInfo. Locals keep the loop on fast lookups.
+    mime_classes = MIME_CLASS
+    min_size_bytes = min_size_mb * 1024 * 1024
 
     for file_data in files:
-        file_info = FileInfo(file_data)
-        if is_eligible_file(file_info, min_size_mb, before_date, include_google_docs):
-            eligible.append(file_info)
+        mime_class = mime_classes.get(file_data.get("mimeType", ""), MIME_REGULAR)
+        if mime_class == MIME_SKIP:
+            continue
+
+        if before_date:
+            modified_time = file_data.get("modifiedTime", "")
+            if modified_time and modified_time[:10] >= before_date:
+                continue
+
+        if mime_class == MIME_GOOGLE_DOC:
+            if include_google_docs:
+                yield FileInfo(file_data)
+            continue
 
-    return eligible
+        if int(file_data.get("size", 0)) >= min_size_bytes:
+            yield FileInfo(file_data)
 
 
 def calculate_total_size(files: List[FileInfo]) -> int:
@@ -118,13 +154,6 @@ def calculate_total_size(files: List[FileInfo]) -> int:
     return sum(f.size for f in files)
 
 
-def format_size(size_bytes: int) -> str:
-    """Format size in bytes to human-readable string."""
-    if size_bytes < 1024:
-        return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+def total_size_from_raw(files: Iterable[Dict[str, Any]]) -> int:
+    """Calculate total size in bytes of raw Drive file dicts, without building FileInfo objects."""
+    return sum(int(d.get("size") or 0) for d in files)
@@ -29,18 +29,21 @@ The app will automatically detect and use the credentials file.
 """
 
 import os
+import threading
 from pathlib import Path
 from typing import Optional, Tuple
 
-from google.auth.transport.requests import Request
+from google.auth.exceptions import RefreshError
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
 
 from storage.config import get_token_path, get_credentials_path
 
 # Required OAuth scopes for Drive access
 SCOPES = ["https://www.googleapis.com/auth/drive"]
 
+# Credentials are loaded/refreshed from both the UI and worker threads
+_credentials_lock = threading.Lock()
+
 
 class AuthError(Exception):
     """Authentication error."""
@@ -60,24 +63,56 @@ class CredentialsMissingError(AuthError):
         )
 
 
+class TokenRejectedError(AuthError):
+    """Raised when Google rejects the saved token, so the user must sign in again."""
+    pass
+
+
 def get_credentials() -> Optional[Credentials]:
     """Load saved credentials if they exist and are valid."""
+    try:
+        return load_credentials()
+    except TokenRejectedError:
+        return None
+
+
+def load_credentials() -> Optional[Credentials]:
+    """
+    Load saved credentials, refreshing the token if it has expired.
+
+    Returns:
+        Valid credentials, or None if none are saved or the token can't
+        be refreshed right now (e.g. offline)
+
+    Raises:
+        TokenRejectedError: If Google rejected the saved token (revoked
+            access or an expired refresh token)
+    """
     token_path = get_token_path()
 
     if not token_path.exists():
         return None
 
     try:
-        creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
+        with _credentials_lock:
+            creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
+
+            # Check if credentials need refresh
+            if creds and creds.expired and creds.refresh_token:
+                # Deferred with the OAuth flow below, so startup (which only
+                # checks the saved token) doesn't import the HTTP transports
+                from google.auth.transport.requests import Request
 
-        # Check if credentials need refresh
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-            save_credentials(creds)
+                creds.refresh(Request())
+                save_credentials(creds)
 
         if creds and creds.valid:
             return creds
         return None
+    except RefreshError as e:
+        if e.retryable:
+            return None
+        raise TokenRejectedError(f"Your Google sign-in is no longer valid: {e}") from e
     except Exception:
         return None
 
@@ -86,8 +121,15 @@ def save_credentials(creds: Credentials) -> None:
     """Save credentials to file."""
     token_path = get_token_path()
     token_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(token_path, "w", encoding="utf-8") as f:
+    temp_path = token_path.with_suffix(token_path.suffix + ".tmp")
+
+    # Write to a temp file and rename, so a crash mid-write can't leave a
+    # truncated token (which would force a full re-auth)
+    with open(temp_path, "w", encoding="utf-8") as f:
         f.write(creds.to_json())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, token_path)
 
 
 def authenticate() -> Tuple[Credentials, str]:
@@ -101,6 +143,8 @@ def authenticate() -> Tuple[Credentials, str]:
         CredentialsMissingError: If credentials.json is not found
         AuthError: If authentication fails
     """
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     creds_path = get_credentials_path()
 
     if not creds_path.exists():
@@ -138,6 +182,26 @@ def revoke_credentials() -> None:
         token_path.unlink()
 
 
+def has_saved_credentials() -> bool:
+    """
+    Check if a usable token is saved, without any network access.
+
+    Unlike is_authenticated(), an expired token is not refreshed here;
+    it counts as usable as long as it can be refreshed later.
+    """
+    token_path = get_token_path()
+
+    if not token_path.exists():
+        return False
+
+    try:
+        creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
+    except Exception:
+        return False
+
+    return bool(creds and (creds.valid or creds.refresh_token))
+
+
 def is_authenticated() -> bool:
     """Check if valid credentials exist."""
     creds = get_credentials()
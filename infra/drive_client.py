@@ -1,15 +1,24 @@
 """Google Drive API client wrapper."""
 
+import hashlib
 import io
+import random
+import sys
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator, Tuple
 
+import httplib2
+import requests
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.http import MediaIoBaseDownload, build_http
 from googleapiclient.errors import HttpError
 
 from infra.auth import get_credentials, CredentialsMissingError
+from infra.filesystem import release_page_cache
 
 
 # Google Docs export MIME types
@@ -35,14 +44,75 @@ GOOGLE_DOC_EXPORTS = {
 # Google Docs types that need export (not direct download)
 GOOGLE_DOC_TYPES = set(GOOGLE_DOC_EXPORTS.keys())
 
+# Files requested per list call; Drive's maximum, to minimise round-trips
+LIST_PAGE_SIZE = 1000
+
+# Bytes fetched per ranged GET. Each chunk is held in memory until written,
+# so this bounds memory per parallel download while still keeping the
+# per-request overhead small next to the transfer time.
+DOWNLOAD_CHUNK_SIZE = 32 * 1024 * 1024
+
+# Bytes written per read from a streamed download response
+STREAM_READ_SIZE = 1024 * 1024
+
+# Retries for a failed download before giving up, with exponential backoff
+DOWNLOAD_RETRIES = 5
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Requests per batch call; Drive allows 100 but starts failing well below that
+TRASH_BATCH_SIZE = 25
+
+
+# httplib2.Http is not thread-safe, so each thread keeps its own
+_thread_local = threading.local()
+
+
+def _get_thread_http() -> httplib2.Http:
+    """
+    Get the calling thread's HTTP connection pool, creating it on first use.
+
+    Every DriveClient built on the same thread shares it, so a new client
+    reuses the open keep-alive connection instead of another TLS handshake.
+    """
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        http = build_http()
+        _thread_local.http = http
+    return http
+
 
 class DriveClientError(Exception):
     """Drive client error."""
     pass
 
 
+class DownloadCancelledError(DriveClientError):
+    """A download was stopped by its cancel callback."""
+
+    def __init__(self):
+        super().__init__("Download cancelled")
+
+
+class _HashingWriter:
+    """Write-only file wrapper that feeds every chunk written into an MD5 hash."""
+
+    def __init__(self, f):
+        self._f = f
+        self.md5 = hashlib.md5()
+
+    def write(self, data: bytes) -> int:
+        self.md5.update(data)
+        return self._f.write(data)
+
+
 class DriveClient:
-    """Google Drive API client for listing, downloading, and managing files."""
+    """
+    Google Drive API client for listing, downloading, and managing files.
+
+    A client is not thread-safe; use one per thread.
+    """
 
     def __init__(self, credentials: Optional[Credentials] = None):
         """
@@ -57,31 +127,88 @@ class DriveClient:
         if credentials is None:
             raise CredentialsMissingError()
 
-        self._service = build("drive", "v3", credentials=credentials)
+        self._credentials = credentials
+        self._session: Optional[AuthorizedSession] = None
+        self._service_obj: Any = None
+
+    @property
+    def _service(self) -> Any:
+        """The Drive v3 service, built on first use."""
+        if self._service_obj is None:
+            # Deferred: the discovery module and building the service from
+            # its ~1 MB document are only paid for once an API call is made
+            from googleapiclient.discovery import build
+
+            http = AuthorizedHttp(self._credentials, http=_get_thread_http())
+            self._service_obj = build("drive", "v3", http=http, static_discovery=True)
+        return self._service_obj
 
     def list_files(
         self,
         min_size_mb: int = 0,
         before_date: str = "",
-        page_size: int = 100,
-        progress_callback: Optional[Callable[[int], None]] = None
+        page_size: int = LIST_PAGE_SIZE,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        cancel_callback: Optional[Callable[[], bool]] = None
     ) -> List[Dict[str, Any]]:
         """
         List files in Drive that meet the size and date thresholds.
 
-        The Drive API v3 does not support filtering by 'size' in the query
-        parameter, so we fetch all non-trashed files owned by the user and
-        filter by size client-side. Date filtering is done server-side.
+        See iter_file_pages() for how filtering is done; use that instead
+        to process files page by page without holding the full listing.
 
         Args:
             min_size_mb: Minimum file size in MB
             before_date: Only include files modified before this date (YYYY-MM-DD), empty to skip
-            page_size: Number of results per API call
+            page_size: Number of results per API call (Drive allows up to 1000)
             progress_callback: Called with count of files found so far
+            cancel_callback: Checked before each page; listing stops early if it returns True
 
         Returns:
             List of file metadata dictionaries
         """
+        files = []
+
+        for page_files in self.iter_file_pages(
+            min_size_mb=min_size_mb,
+            before_date=before_date,
+            page_size=page_size,
+            cancel_callback=cancel_callback
+        ):
+            files.extend(page_files)
+
+            if progress_callback:
+                progress_callback(len(files))
+
+        return files
+
+    def iter_file_pages(
+        self,
+        min_size_mb: int = 0,
+        before_date: str = "",
+        page_size: int = LIST_PAGE_SIZE,
+        cancel_callback: Optional[Callable[[], bool]] = None,
+        exclude_mime_types: Iterable[str] = ()
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield files in Drive that meet the size and date thresholds, one API page at a time.
+
+        The Drive API v3 does not support filtering by 'size' in the query
+        parameter, so we fetch all non-trashed files owned by the user and
+        filter by size client-side. Date and MIME type filtering are done
+        server-side.
+
+        Args:
+            min_size_mb: Minimum file size in MB
+            before_date: Only include files modified before this date (YYYY-MM-DD), empty to skip
+            page_size: Number of results per API call (Drive allows up to 1000)
+            cancel_callback: Checked before each page; listing stops early if it returns True
+            exclude_mime_types: MIME types Drive should leave out of the listing
+                (e.g. folders and shortcuts)
+
+        Yields:
+            List of file metadata dictionaries from each page that meet the size threshold
+        """
         min_size_bytes = min_size_mb * 1024 * 1024
 
         # Drive API v3 query: 'size' is NOT a valid query term,
@@ -92,45 +219,157 @@ class DriveClient:
         if before_date:
             query += f" and modifiedTime < '{before_date}T00:00:00'"
 
-        files = []
+        # So are MIME types; excluded files are never sent at all
+        for mime_type in sorted(exclude_mime_types):
+            query += f" and mimeType != '{mime_type}'"
+
         page_token = None
 
         while True:
+            if cancel_callback and cancel_callback():
+                return
+
             try:
                 results = self._service.files().list(
                     q=query,
                     pageSize=page_size,
                     pageToken=page_token,
-                    fields="nextPageToken, files(id, name, size, mimeType, modifiedTime, parents)",
+                    fields="nextPageToken, files(id, name, size, mimeType, modifiedTime, parents, md5Checksum)",
                     orderBy="modifiedTime desc"
                 ).execute()
+            except HttpError as e:
+                raise DriveClientError(f"Failed to list files: {e}")
 
-                batch = results.get("files", [])
+            batch = results.get("files", [])
 
-                # Filter by size client-side
-                for f in batch:
-                    file_size = int(f.get("size", 0))
-                    if file_size >= min_size_bytes:
-                        files.append(f)
+            # Filter by size client-side. MIME types repeat heavily, so intern
+            # them to share one string and speed up later set/dict lookups.
+            page_files = []
+            for f in batch:
+                if int(f.get("size", 0)) >= min_size_bytes:
+                    f["mimeType"] = sys.intern(f.get("mimeType", ""))
+                    page_files.append(f)
+            yield page_files
 
-                if progress_callback:
-                    progress_callback(len(files))
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                return
 
-                page_token = results.get("nextPageToken")
-                if not page_token:
-                    break
+    def get_user_id(self) -> str:
+        """Get the signed-in user's permission ID, which is stable for the account."""
+        try:
+            about = self._service.about().get(fields="user(permissionId)").execute()
+            return about.get("user", {}).get("permissionId", "")
+        except HttpError as e:
+            raise DriveClientError(f"Failed to get account info: {e}")
+
+    def get_start_page_token(self) -> str:
+        """Get a changes page token for the current state of the Drive."""
+        try:
+            return self._service.changes().getStartPageToken().execute()["startPageToken"]
+        except HttpError as e:
+            raise DriveClientError(f"Failed to get changes token: {e}")
+
+    def get_sync_state(self) -> Tuple[str, str]:
+        """
+        Get the user's permission ID and a changes start page token together.
+
+        Both requests go out in one batch call, saving a round-trip over
+        calling get_user_id() and get_start_page_token() in turn.
+
+        Returns:
+            (user_id, start_page_token)
+        """
+        responses: Dict[str, Any] = {}
+
+        def on_response(request_id: str, response: Any, exception: Optional[Exception]) -> None:
+            if exception is not None:
+                responses[request_id] = exception
+            else:
+                responses[request_id] = response
+
+        batch = self._service.new_batch_http_request(callback=on_response)
+        batch.add(self._service.about().get(fields="user(permissionId)"), request_id="about")
+        batch.add(self._service.changes().getStartPageToken(), request_id="token")
+
+        try:
+            batch.execute()
+        except HttpError as e:
+            raise DriveClientError(f"Failed to get account info: {e}")
+        except KeyError as e:
+            # The batch raises KeyError when the server left a part out of its reply
+            raise DriveClientError(f"Failed to get account info: no response for {e}")
+
+        for request_id in ("about", "token"):
+            response = responses.get(request_id)
+            if response is None:
+                raise DriveClientError(f"Failed to get account info: no '{request_id}' response")
+            if isinstance(response, Exception):
+                raise DriveClientError(f"Failed to get account info: {response}")
+
+        start_token = responses["token"].get("startPageToken")
+        if not start_token:
+            raise DriveClientError("Failed to get account info: no start page token returned")
+
+        user_id = responses["about"].get("user", {}).get("permissionId", "")
+        return user_id, start_token
+
+    def iter_change_pages(
+        self,
+        page_token: str,
+        page_size: int = LIST_PAGE_SIZE,
+        cancel_callback: Optional[Callable[[], bool]] = None
+    ) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """
+        Yield the changes made since page_token, one API page at a time.
+
+        Each change has 'fileId', 'removed', and (unless removed) 'file'
+        with the same fields as iter_file_pages() plus 'trashed' and
+        'ownedByMe'.
+
+        Args:
+            page_token: Token from get_start_page_token() or a previous sync
+            page_size: Number of changes per API call (Drive allows up to 1000)
+            cancel_callback: Checked before each page; listing stops early if it returns True
+
+        Yields:
+            (changes, new_start_page_token); the token is only set on the last
+            page, and is where the next sync should start
+        """
+        while page_token:
+            if cancel_callback and cancel_callback():
+                return
 
+            try:
+                results = self._service.changes().list(
+                    pageToken=page_token,
+                    pageSize=page_size,
+                    spaces="drive",
+                    includeRemoved=True,
+                    fields=(
+                        "nextPageToken, newStartPageToken, changes(fileId, removed, "
+                        "file(id, name, size, mimeType, modifiedTime, parents, md5Checksum, "
+                        "trashed, ownedByMe))"
+                    )
+                ).execute()
             except HttpError as e:
-                raise DriveClientError(f"Failed to list files: {e}")
+                raise DriveClientError(f"Failed to list changes: {e}")
 
-        return files
+            changes = results.get("changes", [])
+            for change in changes:
+                file_data = change.get("file")
+                if file_data:
+                    file_data["mimeType"] = sys.intern(file_data.get("mimeType", ""))
+
+            yield changes, results.get("newStartPageToken")
+            page_token = results.get("nextPageToken")
 
     def get_file_info(self, file_id: str) -> Dict[str, Any]:
         """Get metadata for a specific file."""
         try:
             return self._service.files().get(
                 fileId=file_id,
-                fields="id, name, size, mimeType, modifiedTime, parents"
+                fields="id, name, size, mimeType, modifiedTime, parents, md5Checksum"
             ).execute()
         except HttpError as e:
             raise DriveClientError(f"Failed to get file info: {e}")
@@ -140,61 +379,207 @@ class DriveClient:
         file_id: str,
         dest_path: Path,
         mime_type: str,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        expected_md5: str = "",
+        cancel_callback: Optional[Callable[[], bool]] = None
     ) -> Path:
         """
         Download a file from Drive.
 
         Args:
             file_id: The file's Drive ID
-            dest_path: Destination path for the downloaded file
+            dest_path: Destination path for the downloaded file (its folder
+                must already exist, see organizer.ensure_structure)
             mime_type: The file's MIME type (to determine if export needed)
             progress_callback: Called with (bytes_downloaded, total_bytes)
+            expected_md5: Drive's md5Checksum for the file, empty to skip the
+                check. Google Docs exports have no checksum and are never checked.
+            cancel_callback: Returns True to stop the download; checked
+                between chunks, so a large file stops mid-transfer
 
         Returns:
             The actual path where file was saved (may differ for Google Docs)
-        """
-        dest_path.parent.mkdir(parents=True, exist_ok=True)
 
+        Raises:
+            DownloadCancelledError: If cancel_callback stopped the download
+                (the partial file is removed)
+            DriveClientError: If the download fails or doesn't match expected_md5
+        """
         # Check if this is a Google Doc that needs export
         if mime_type in GOOGLE_DOC_TYPES:
-            return self._export_google_doc(file_id, dest_path, mime_type, progress_callback)
+            actual_path = dest_path.with_suffix(GOOGLE_DOC_EXPORTS[mime_type][1])
+        else:
+            actual_path = dest_path
 
-        return self._download_binary_file(file_id, dest_path, progress_callback)
+        try:
+            if mime_type in GOOGLE_DOC_TYPES:
+                return self._export_google_doc(
+                    file_id, dest_path, mime_type, progress_callback, cancel_callback
+                )
+
+            return self._download_binary_file(
+                file_id, dest_path, progress_callback, expected_md5, cancel_callback
+            )
+        except DownloadCancelledError:
+            actual_path.unlink(missing_ok=True)
+            raise
 
     def _download_binary_file(
         self,
         file_id: str,
         dest_path: Path,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        expected_md5: str = "",
+        cancel_callback: Optional[Callable[[], bool]] = None
     ) -> Path:
-        """Download a regular (non-Google Docs) file."""
+        """
+        Download a regular (non-Google Docs) file.
+
+        The file is streamed from a single GET and written as it arrives,
+        resuming after transient failures. If it still can't complete, the
+        file is downloaded again with MediaIoBaseDownload's ranged requests.
+        The MD5 is computed from the bytes as they are written, so checking
+        it needs no second read.
+        """
+        request = self._service.files().get_media(fileId=file_id)
+
         try:
-            request = self._service.files().get_media(fileId=file_id)
+            md5_hex = self._stream_media(
+                request.uri, dest_path, progress_callback, cancel_callback
+            )
+        except requests.RequestException:
+            md5_hex = self._download_media_chunks(
+                request, dest_path, progress_callback, cancel_callback
+            )
+
+        if expected_md5 and md5_hex != expected_md5:
+            raise DriveClientError("Downloaded file does not match the MD5 checksum from Drive")
+
+        return dest_path
+
+    def _download_media_chunks(
+        self,
+        request: Any,
+        dest_path: Path,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_callback: Optional[Callable[[], bool]] = None
+    ) -> str:
+        """
+        Download a media request to a file with ranged MediaIoBaseDownload requests.
 
+        Returns:
+            MD5 hex digest of the bytes written
+        """
+        try:
             with open(dest_path, "wb") as f:
-                downloader = MediaIoBaseDownload(f, request)
+                writer = _HashingWriter(f)
+                downloader = MediaIoBaseDownload(writer, request, chunksize=DOWNLOAD_CHUNK_SIZE)
                 done = False
 
                 while not done:
-                    status, done = downloader.next_chunk()
+                    if cancel_callback and cancel_callback():
+                        raise DownloadCancelledError()
+                    status, done = downloader.next_chunk(num_retries=DOWNLOAD_RETRIES)
                     if progress_callback and status:
                         progress_callback(
                             int(status.resumable_progress),
                             int(status.total_size)
                         )
 
-            return dest_path
+                release_page_cache(f)
+
+            return writer.md5.hexdigest()
 
         except HttpError as e:
             raise DriveClientError(f"Failed to download file: {e}")
 
+    def _stream_media(
+        self,
+        uri: str,
+        dest_path: Path,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_callback: Optional[Callable[[], bool]] = None
+    ) -> str:
+        """
+        Stream a media URL to a file over one HTTP response.
+
+        If the transfer breaks or Drive answers with a transient error, it
+        is retried with backoff up to DOWNLOAD_RETRIES times. Retries send
+        a Range header, so bytes already written are not downloaded again.
+
+        Returns:
+            MD5 hex digest of the bytes written
+
+        Raises:
+            DownloadCancelledError: If cancel_callback stopped the download
+            DriveClientError: If Drive rejects the request
+            requests.RequestException: If the connection keeps failing
+        """
+        if self._session is None:
+            self._session = AuthorizedSession(self._credentials)
+
+        md5 = hashlib.md5()
+        downloaded = 0
+        attempt = 0
+
+        with open(dest_path, "wb") as f:
+            while True:
+                headers = {"Range": f"bytes={downloaded}-"} if downloaded else {}
+
+                try:
+                    with self._session.get(uri, stream=True, headers=headers) as response:
+                        status = response.status_code
+                        if status in RETRYABLE_STATUSES and attempt < DOWNLOAD_RETRIES:
+                            raise requests.HTTPError(f"HTTP {status}", response=response)
+                        if status >= 400:
+                            raise DriveClientError(
+                                f"Failed to download file: HTTP {status} {response.reason}"
+                            )
+
+                        # The range was ignored and the whole file is coming again
+                        if downloaded and status != 206:
+                            f.seek(0)
+                            f.truncate()
+                            md5 = hashlib.md5()
+                            downloaded = 0
+
+                        total = downloaded + int(response.headers.get("Content-Length", 0))
+
+                        for chunk in response.iter_content(chunk_size=STREAM_READ_SIZE):
+                            # Leaving the with block closes the connection mid-body
+                            if cancel_callback and cancel_callback():
+                                raise DownloadCancelledError()
+                            f.write(chunk)
+                            md5.update(chunk)
+                            downloaded += len(chunk)
+                            if progress_callback:
+                                progress_callback(downloaded, total)
+
+                        if downloaded < total:
+                            raise requests.ConnectionError("Download ended early")
+
+                    break
+
+                except requests.RequestException:
+                    if attempt >= DOWNLOAD_RETRIES:
+                        raise
+
+                attempt += 1
+                if cancel_callback and cancel_callback():
+                    raise DownloadCancelledError()
+                time.sleep(min(2 ** attempt, 32) + random.random())
+
+            release_page_cache(f)
+
+        return md5.hexdigest()
+
     def _export_google_doc(
         self,
         file_id: str,
         dest_path: Path,
         mime_type: str,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_callback: Optional[Callable[[], bool]] = None
     ) -> Path:
         """Export a Google Docs/Sheets/Slides file."""
         export_mime, extension = GOOGLE_DOC_EXPORTS[mime_type]
@@ -209,17 +594,21 @@ class DriveClient:
             )
 
             with open(actual_path, "wb") as f:
-                downloader = MediaIoBaseDownload(f, request)
+                downloader = MediaIoBaseDownload(f, request, chunksize=DOWNLOAD_CHUNK_SIZE)
                 done = False
 
                 while not done:
-                    status, done = downloader.next_chunk()
+                    if cancel_callback and cancel_callback():
+                        raise DownloadCancelledError()
+                    status, done = downloader.next_chunk(num_retries=DOWNLOAD_RETRIES)
                     if progress_callback and status:
                         progress_callback(
                             int(status.resumable_progress or 0),
                             int(status.total_size or 0)
                         )
 
+                release_page_cache(f)
+
             return actual_path
 
         except HttpError as e:
@@ -235,43 +624,47 @@ class DriveClient:
         except HttpError as e:
             raise DriveClientError(f"Failed to trash file: {e}")
 
-    def get_file_path(self, file_id: str) -> str:
-        """Get the full path of a file in Drive (folder structure)."""
-        try:
-            path_parts = []
-            current_id = file_id
+    def trash_files_batch(self, file_ids: List[str]) -> Dict[str, str]:
+        """
+        Move several files to Trash using batch requests.
 
-            while current_id:
-                file_info = self._service.files().get(
-                    fileId=current_id,
-                    fields="name, parents"
-                ).execute()
+        Sends up to TRASH_BATCH_SIZE updates per HTTP round-trip instead
+        of one round-trip per file.
 
-                path_parts.insert(0, file_info.get("name", ""))
-                parents = file_info.get("parents", [])
+        Args:
+            file_ids: Drive IDs of the files to trash
 
-                if parents:
-                    current_id = parents[0]
-                else:
-                    break
+        A batch call that fails outright only marks the files in that batch
+        as failed; files trashed by earlier batches are still reported as
+        trashed, and later batches are still sent.
 
-            return "/".join(path_parts)
+        Returns:
+            Error message by file ID, for each file that could not be trashed
+        """
+        failures: Dict[str, str] = {}
+
+        def on_response(request_id: str, response: Any, exception: Optional[Exception]) -> None:
+            if exception is not None:
+                failures[request_id] = str(exception)
+
+        for start in range(0, len(file_ids), TRASH_BATCH_SIZE):
+            chunk = file_ids[start:start + TRASH_BATCH_SIZE]
+            batch = self._service.new_batch_http_request(callback=on_response)
+            for file_id in chunk:
+                batch.add(
+                    self._service.files().update(fileId=file_id, body={"trashed": True}),
+                    request_id=file_id
+                )
 
-        except HttpError:
-            return ""
+            try:
+                batch.execute()
+            except (HttpError, httplib2.HttpLib2Error, OSError) as e:
+                # The batch as a whole got no answer, so none of its files were trashed
+                for file_id in chunk:
+                    failures[file_id] = f"Failed to trash files: {e}"
+
+        return failures
 
     def is_google_doc(self, mime_type: str) -> bool:
         """Check if a MIME type is a Google Docs type."""
         return mime_type in GOOGLE_DOC_TYPES
-
-
-def format_size(size_bytes: int) -> str:
-    """Format size in bytes to human-readable string."""
-    if size_bytes < 1024:
-        return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
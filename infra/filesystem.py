@@ -1,10 +1,9 @@
 """Safe file system operations."""
 
-import hashlib
 import os
 import shutil
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import BinaryIO, Optional, Set, Tuple
 
 
 class FileSystemError(Exception):
@@ -38,18 +37,6 @@ def get_disk_free_space(path: Path) -> int:
         raise FileSystemError(f"Could not get disk space: {e}")
 
 
-def format_size(size_bytes: int) -> str:
-    """Format size in bytes to human-readable string."""
-    if size_bytes < 1024:
-        return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
-
-
 def ensure_dir(path: Path) -> None:
     """Create directory and parents if they don't exist."""
     path.mkdir(parents=True, exist_ok=True)
@@ -78,15 +65,27 @@ def safe_write(dest_path: Path, data: bytes) -> None:
         raise FileSystemError(f"Failed to write file: {e}")
 
 
-def calculate_md5(file_path: Path, chunk_size: int = 8192) -> str:
-    """Calculate MD5 hash of a file."""
-    md5 = hashlib.md5()
+def release_page_cache(f: BinaryIO) -> None:
+    """
+    Tell the OS a just-written file's cached pages won't be needed again.
 
-    with open(file_path, "rb") as f:
-        while chunk := f.read(chunk_size):
-            md5.update(chunk)
+    Archive files are written once and not read back, so without this a
+    long run fills the page cache and evicts other programs' data. Only
+    has an effect where posix_fadvise exists (Linux); a no-op elsewhere.
 
-    return md5.hexdigest()
+    The data is written to disk first: the kernel doesn't drop dirty
+    pages, and the original may be trashed as soon as the copy is verified.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    f.flush()
+    try:
+        os.fdatasync(f.fileno())
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        # Only a hint; some file systems don't support it
+        pass
 
 
 def verify_download(local_path: Path, expected_size: Optional[int] = None) -> bool:
@@ -116,25 +115,55 @@ def verify_download(local_path: Path, expected_size: Optional[int] = None) -> bo
     return True
 
 
-def get_unique_path(dest_path: Path) -> Path:
+def get_unique_path(dest_path: Path, reserved: Optional[Set[Path]] = None) -> Path:
     """
     Get a unique file path by appending a number if file exists.
 
     Example: file.txt -> file (1).txt -> file (2).txt
+
+    Numbered names are probed by doubling, then binary search, so a name
+    with N existing copies costs O(log N) checks instead of N. If some
+    numbers in the run were deleted, a later free number may be chosen.
+
+    Args:
+        dest_path: Preferred destination path
+        reserved: Paths already handed out but not yet written. They count
+            as taken, and the returned path is added to the set.
     """
-    if not dest_path.exists():
-        return dest_path
+    def is_taken(path: Path) -> bool:
+        return (reserved is not None and path in reserved) or path.exists()
 
-    stem = dest_path.stem
-    suffix = dest_path.suffix
-    parent = dest_path.parent
+    new_path = dest_path
+    if is_taken(new_path):
+        stem = dest_path.stem
+        suffix = dest_path.suffix
+        parent = dest_path.parent
 
-    counter = 1
-    while True:
-        new_path = parent / f"{stem} ({counter}){suffix}"
-        if not new_path.exists():
-            return new_path
-        counter += 1
+        def numbered(counter: int) -> Path:
+            return parent / f"{stem} ({counter}){suffix}"
+
+        # Double until a free number is found; everything below low is taken
+        low, high = 0, 1
+        while is_taken(numbered(high)):
+            low, high = high, high * 2
+
+        # Narrow to the first free number between low (taken) and high (free)
+        while high - low > 1:
+            mid = (low + high) // 2
+            if is_taken(numbered(mid)):
+                low = mid
+            else:
+                high = mid
+
+        new_path = numbered(high)
+
+    if reserved is not None:
+        reserved.add(new_path)
+    return new_path
+
+
+# Characters not allowed in Windows filenames, each mapped to "_"
+_INVALID_FILENAME_CHARS = str.maketrans({char: "_" for char in '<>:"/\\|?*'})
 
 
 def clean_filename(filename: str) -> str:
@@ -143,21 +172,12 @@ def clean_filename(filename: str) -> str:
 
     Removes or replaces invalid characters.
     """
-    # Characters not allowed in Windows filenames
-    invalid_chars = '<>:"/\\|?*'
-
-    cleaned = filename
-    for char in invalid_chars:
-        cleaned = cleaned.replace(char, "_")
-
-    # Remove leading/trailing spaces and dots
-    cleaned = cleaned.strip(" .")
+    # One translate pass instead of a replace() per invalid character,
+    # then remove leading/trailing spaces and dots
+    cleaned = filename.translate(_INVALID_FILENAME_CHARS).strip(" .")
 
     # Ensure non-empty
-    if not cleaned:
-        cleaned = "unnamed"
-
-    return cleaned
+    return cleaned or "unnamed"
 
 
 def delete_file(file_path: Path) -> None:
@@ -0,0 +1,19 @@
+"""Human-readable formatting helpers."""
+
+
+# format_size units, indexed by floor(log1024(size)): (divisor, suffix, decimals)
+_SIZE_UNITS = (
+    (1, "B", 0),
+    (1024, "KB", 1),
+    (1024 * 1024, "MB", 1),
+    (1024 * 1024 * 1024, "GB", 2),
+)
+
+
+def format_size(size_bytes: int) -> str:
+    """Format size in bytes to human-readable string."""
+    unit = min(max(size_bytes.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+    if unit == 0:
+        return f"{size_bytes} B"
+    scale, suffix, precision = _SIZE_UNITS[unit]
+    return f"{size_bytes / scale:.{precision}f} {suffix}"
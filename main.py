@@ -20,8 +20,8 @@ from pathlib import Path
 
 from PySide6.QtWidgets import QApplication, QMessageBox
 
-from storage.config import Config, get_credentials_path
-from infra.auth import is_authenticated
+from storage.config import Config, ensure_config_dir, get_credentials_path
+from infra.auth import has_saved_credentials
 
 
 def check_credentials() -> bool:
@@ -58,14 +58,16 @@ def main():
     app.setOrganizationName("DriveArchiver")
 
     # Load configuration
+    ensure_config_dir()
     config = Config()
 
     # Check for credentials
     if not check_credentials():
         return 1
 
-    # Determine which window to show
-    if not config.is_connected or not is_authenticated():
+    # Determine which window to show (token refresh happens in the
+    # background once the main window is up)
+    if not config.is_connected or not has_saved_credentials():
         # First run or not authenticated - show wizard
         from app.onboarding_wizard import OnboardingWizard
 
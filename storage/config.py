@@ -3,35 +3,61 @@
 import json
 import os
 import sys
+from functools import cache
 from pathlib import Path
 from typing import Any
 
 
+@cache
 def get_config_dir() -> Path:
-    """Get the application config directory."""
+    """
+    Get the application config directory.
+
+    Cached, as the location never changes while the app runs. The folder
+    itself is created by ensure_config_dir().
+    """
     appdata = os.environ.get("APPDATA", "")
     if appdata:
-        config_dir = Path(appdata) / "DriveArchiver"
-    else:
-        config_dir = Path.home() / ".drive_archiver"
+        return Path(appdata) / "DriveArchiver"
+    return Path.home() / ".drive_archiver"
+
+
+def ensure_config_dir() -> Path:
+    """Create the application config directory if needed (once, at startup)."""
+    config_dir = get_config_dir()
     config_dir.mkdir(parents=True, exist_ok=True)
     return config_dir
 
 
+@cache
 def get_config_path() -> Path:
     """Get the path to the config file."""
     return get_config_dir() / "config.json"
 
 
+@cache
 def get_token_path() -> Path:
     """Get the path to the OAuth token file."""
     return get_config_dir() / "token.json"
 
 
+@cache
+def get_scan_cache_path() -> Path:
+    """Get the path to the cached scan results file."""
+    return get_config_dir() / "scan_cache.json"
+
+
+@cache
+def get_metadata_cache_path() -> Path:
+    """Get the path to the local Drive metadata database."""
+    return get_config_dir() / "drive_metadata.db"
+
+
 def get_credentials_path() -> Path:
     """Get the path to the OAuth credentials file.
 
     Checks bundled location (PyInstaller), then app directory, then config directory.
+    Not cached: the user may add credentials.json while the app is running.
     """
     # Check bundled location first (PyInstaller .exe)
     if getattr(sys, "frozen", False):
@@ -82,7 +108,7 @@ class Config:
                 with open(config_path, "r", encoding="utf-8") as f:
                     self._data = json.load(f)
             except (json.JSONDecodeError, IOError):
-                self._data = DEFAULT_CONFIG.copy()
+                self._data = self._deep_copy(DEFAULT_CONFIG)
         else:
             self._data = self._deep_copy(DEFAULT_CONFIG)
 
@@ -93,8 +119,17 @@ class Config:
         """Save configuration to file."""
         config_path = get_config_path()
         config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_path, "w", encoding="utf-8") as f:
+        temp_path = config_path.with_suffix(config_path.suffix + ".tmp")
+
+        with open(temp_path, "w", encoding="utf-8") as f:
             json.dump(self._data, f, indent=2)
+            # Make the data durable before the rename, or a power loss
+            # could still leave a renamed but empty file
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Atomic rename so a crash mid-write can't leave a torn config
+        os.replace(temp_path, config_path)
 
     def _merge_defaults(self) -> None:
         """Ensure all default keys exist in loaded config."""
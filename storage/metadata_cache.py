@@ -0,0 +1,137 @@
+"""Local SQLite store of Drive file metadata, kept current with the Drive changes feed."""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+
+from storage.config import get_metadata_cache_path
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mime_type TEXT NOT NULL,
+    modified_time TEXT NOT NULL,
+    parents TEXT NOT NULL,
+    md5 TEXT
+);
+CREATE INDEX IF NOT EXISTS files_modified_time ON files (modified_time);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class MetadataCache:
+    """
+    Mirror of the user's Drive file listing.
+
+    The first scan stores the full listing together with a Drive changes
+    page token; later scans only apply the changes since that token and
+    query the mirror. Edits are transactional: nothing is kept unless
+    commit() is called, so a cancelled or failed sync leaves the previous
+    state intact.
+
+    The connection is bound to the thread that created the cache.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self._conn = sqlite3.connect(str(path or get_metadata_cache_path()))
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database, discarding uncommitted changes."""
+        self._conn.close()
+
+    def get_page_token(self, user_id: str) -> Optional[str]:
+        """
+        Get the changes page token to sync from.
+
+        Returns:
+            The stored token, or None if the mirror is empty or belongs to another account
+        """
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        if meta.get("user_id") != user_id:
+            return None
+        return meta.get("page_token")
+
+    def clear(self) -> None:
+        """Remove all files, ahead of storing a full listing."""
+        self._conn.execute("DELETE FROM files")
+        self._conn.execute("DELETE FROM meta")
+
+    def upsert(self, files: Iterable[Dict[str, Any]]) -> None:
+        """Insert or update files from Drive metadata dictionaries."""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    f["id"],
+                    f.get("name", ""),
+                    int(f.get("size", 0)),
+                    f.get("mimeType", ""),
+                    f.get("modifiedTime", ""),
+                    json.dumps(f.get("parents", [])),
+                    f.get("md5Checksum"),
+                )
+                for f in files
+            )
+        )
+
+    def remove(self, file_ids: Iterable[str]) -> None:
+        """Remove files by Drive ID (IDs not in the mirror are ignored)."""
+        self._conn.executemany("DELETE FROM files WHERE id = ?", ((i,) for i in file_ids))
+
+    def commit(self, user_id: str, page_token: str) -> None:
+        """Keep all changes made since the last commit, and the token they bring the mirror up to."""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+            (("user_id", user_id), ("page_token", page_token))
+        )
+        self._conn.commit()
+
+    def rollback(self) -> None:
+        """Discard all changes made since the last commit."""
+        self._conn.rollback()
+
+    def iter_file_pages(self, page_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield all mirrored files, newest first.
+
+        Files come back as Drive-style metadata dictionaries, in pages, the
+        same shape DriveClient.iter_file_pages() yields. Eligibility is
+        left to the caller (see core.planner).
+
+        Args:
+            page_size: Number of files per yielded page
+        """
+        cursor = self._conn.execute(
+            "SELECT id, name, size, mime_type, modified_time, parents, md5 FROM files"
+            " ORDER BY modified_time DESC"
+        )
+        intern = sys.intern
+
+        while True:
+            rows = cursor.fetchmany(page_size)
+            if not rows:
+                return
+
+            page = []
+            for file_id, name, size, mime_type, modified_time, parents, md5 in rows:
+                file_data = {
+                    "id": file_id,
+                    "name": name,
+                    "size": size,
+                    "mimeType": intern(mime_type),
+                    "modifiedTime": modified_time,
+                    "parents": json.loads(parents),
+                }
+                if md5:
+                    file_data["md5Checksum"] = md5
+                page.append(file_data)
+            yield page
@@ -0,0 +1,63 @@
+"""Persistent cache of the last scan results."""
+
+import json
+import os
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence
+
+from storage.config import get_scan_cache_path
+
+
+class ScanCache:
+    """
+    Stores the most recent scan results on disk.
+
+    Results are keyed by the account and filter settings they were
+    produced with, so a cached scan is only reused for the same query.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = path or get_scan_cache_path()
+
+    def load(self, key: Sequence[Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load cached scan results.
+
+        Args:
+            key: Account/filter settings the results must match
+
+        Returns:
+            List of file metadata dictionaries, or None if nothing matches
+        """
+        if not self._path.exists():
+            return None
+
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return None
+
+        if data.get("key") != list(key):
+            return None
+        return data.get("files")
+
+    def save(self, key: Sequence[Any], files: List[Dict[str, Any]]) -> None:
+        """Save scan results, replacing any previous entry."""
+        temp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": list(key), "files": files}, f)
+                f.flush()
+                os.fsync(f.fileno())
+
+            # Atomic rename so a crash mid-write can't leave a torn cache
+            os.replace(temp_path, self._path)
+        except IOError:
+            pass
+
+    def clear(self) -> None:
+        """Discard cached scan results."""
+        if self._path.exists():
+            self._path.unlink()
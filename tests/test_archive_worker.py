@@ -0,0 +1,94 @@
+"""Tests for workers.archive_worker path planning and progress reporting."""
+
+import threading
+import unittest
+from pathlib import Path
+
+from core.planner import FileInfo
+from infra.filesystem import get_unique_path
+from workers.archive_worker import ArchiveWorker
+
+
+def drive_file(file_id, name, mime_type, size=1000):
+    """Build a Drive-style file metadata dictionary."""
+    return {
+        "id": file_id,
+        "name": name,
+        "size": str(size),
+        "mimeType": mime_type,
+        "modifiedTime": "2024-01-05T00:00:00.000Z",
+    }
+
+
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+GOOGLE_DOC = "application/vnd.google-apps.document"
+
+
+class PlanLocalPathTests(unittest.TestCase):
+    """ArchiveWorker._plan_local_path() and name reservation."""
+
+    def setUp(self):
+        self.root = Path("/archive-that-does-not-exist")
+        self.worker = ArchiveWorker([], str(self.root))
+
+    def plan(self, file_data):
+        return self.worker._plan_local_path(FileInfo(file_data))
+
+    def test_google_doc_is_planned_under_its_export_name(self):
+        path = self.plan(drive_file("a", "Report", GOOGLE_DOC))
+        self.assertEqual(path.name, "Report.docx")
+
+    def test_export_extension_is_not_doubled(self):
+        path = self.plan(drive_file("a", "Report.docx", GOOGLE_DOC))
+        self.assertEqual(path.name, "Report.docx")
+
+    def test_dotted_doc_name_keeps_its_dots(self):
+        path = self.plan(drive_file("a", "v1.2", GOOGLE_DOC))
+        self.assertEqual(path.name, "v1.2.docx")
+        # download_file() swaps the suffix, which must leave this name as is
+        self.assertEqual(path.with_suffix(".docx"), path)
+
+    def test_doc_and_binary_with_same_final_name_get_distinct_paths(self):
+        planned = [
+            self.plan(drive_file("a", "Report", GOOGLE_DOC)),
+            self.plan(drive_file("b", "Report.docx", DOCX)),
+        ]
+        reserved = set()
+        paths = [get_unique_path(p, reserved) for p in planned]
+
+        self.assertEqual(planned[0], planned[1])
+        self.assertEqual(len(set(paths)), 2)
+
+
+class BytesProgressTests(unittest.TestCase):
+    """Download progress summed over the parallel downloads."""
+
+    def setUp(self):
+        files = [drive_file(f"f{i}", f"f{i}.bin", "application/octet-stream") for i in range(8)]
+        self.worker = ArchiveWorker(files, "/archive-that-does-not-exist")
+
+    def test_progress_from_all_threads_adds_up(self):
+        def download(file_id):
+            for done in range(0, 1001, 100):
+                self.worker._on_file_progress(file_id, done)
+
+        threads = [
+            threading.Thread(target=download, args=(f"f{i}",)) for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.worker._bytes_done, 8000)
+
+    def test_restarted_download_is_not_double_counted(self):
+        self.worker._on_file_progress("f0", 600)
+        self.worker._on_file_progress("f0", 200)
+        self.worker._on_file_progress("f1", 300)
+
+        self.assertEqual(self.worker._bytes_done, 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
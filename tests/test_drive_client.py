@@ -0,0 +1,234 @@
+"""Tests for infra.drive_client, against fake HTTP transports."""
+
+import hashlib
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import httplib2
+import requests
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+from infra.drive_client import DriveClient, DriveClientError, DownloadCancelledError, TRASH_BATCH_SIZE
+
+
+NOT_FOUND = '{"error": {"code": 404, "message": "File not found"}}'
+
+
+class FakeBatchHttp:
+    """
+    Answers Drive batch calls, one multipart response per call.
+
+    Calls whose (0-based) number is in fail_calls get an HTTP 500 for the
+    whole batch; parts whose file ID is in fail_ids get a 404.
+    """
+
+    def __init__(self, fail_calls=(), fail_ids=()):
+        self.fail_calls = set(fail_calls)
+        self.fail_ids = set(fail_ids)
+        self.calls = 0
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        call = self.calls
+        self.calls += 1
+        if call in self.fail_calls:
+            return httplib2.Response({"status": "500"}), b"Backend Error"
+
+        parts = []
+        for content_id in re.findall(r"Content-ID: <([^>]+)>", body):
+            file_id = content_id.split("+")[-1].strip()
+            if file_id in self.fail_ids:
+                status, payload = "404 Not Found", NOT_FOUND
+            else:
+                status, payload = "200 OK", '{"id": "%s"}' % file_id
+            parts.append((content_id, status, payload))
+        return batch_response(parts)
+
+
+class FakeSyncStateHttp:
+    """Answers the about/token batch from get_sync_state() with prepared parts."""
+
+    def __init__(self, parts):
+        # request_id -> (status, payload); IDs left out get no part at all
+        self.parts = parts
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        parts = []
+        for content_id in re.findall(r"Content-ID: <([^>]+)>", body):
+            request_id = content_id.split("+")[-1].strip()
+            if request_id in self.parts:
+                parts.append((content_id, *self.parts[request_id]))
+        return batch_response(parts)
+
+
+def batch_response(parts):
+    """Build a multipart batch reply from (content_id, status, payload) parts."""
+    body = "".join(
+        "--batch\r\n"
+        "Content-Type: application/http\r\n"
+        f"Content-ID: <response-{content_id}>\r\n\r\n"
+        f"HTTP/1.1 {status}\r\n"
+        "Content-Type: application/json\r\n\r\n"
+        f"{payload}\r\n"
+        for content_id, status, payload in parts
+    )
+    response = httplib2.Response({
+        "status": "200",
+        "content-type": "multipart/mixed; boundary=batch",
+    })
+    return response, (body + "--batch--").encode()
+
+
+class FakeResponse:
+    """Streamed requests response over a slice of a byte string."""
+
+    def __init__(self, data, status, cut_after=None):
+        self.status_code = status
+        self.reason = "OK"
+        self.headers = {"Content-Length": str(len(data))}
+        self._data = data
+        self._cut_after = cut_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def iter_content(self, chunk_size):
+        sent = 0
+        while sent < len(self._data):
+            if self._cut_after is not None and sent >= self._cut_after:
+                raise requests.ConnectionError("Connection reset")
+            chunk = self._data[sent:sent + 4]
+            sent += len(chunk)
+            yield chunk
+
+
+class FakeSession:
+    """Media session that honours Range headers and breaks the first transfer midway."""
+
+    def __init__(self, data, cut_after):
+        self.data = data
+        self.cut_after = cut_after
+        self.ranges = []
+
+    def get(self, uri, stream=False, headers=None):
+        header = (headers or {}).get("Range")
+        self.ranges.append(header)
+        if header:
+            start = int(header[len("bytes="):-1])
+            return FakeResponse(self.data[start:], 206)
+
+        cut_after, self.cut_after = self.cut_after, None
+        return FakeResponse(self.data, 200, cut_after)
+
+
+def make_client(http):
+    """Build a DriveClient whose service talks to a fake HTTP object."""
+    client = DriveClient(credentials=Credentials("token"))
+    client._service_obj = build("drive", "v3", http=http, static_discovery=True)
+    return client
+
+
+class TrashFilesBatchTests(unittest.TestCase):
+    """DriveClient.trash_files_batch() failure reporting."""
+
+    def setUp(self):
+        self.file_ids = [f"file{i}" for i in range(TRASH_BATCH_SIZE * 2 + 10)]
+
+    def test_all_trashed(self):
+        http = FakeBatchHttp()
+        self.assertEqual(make_client(http).trash_files_batch(self.file_ids), {})
+        self.assertEqual(http.calls, 3)
+
+    def test_failed_parts_are_reported_individually(self):
+        http = FakeBatchHttp(fail_ids={"file3", "file40"})
+        failures = make_client(http).trash_files_batch(self.file_ids)
+        self.assertEqual(set(failures), {"file3", "file40"})
+
+    def test_failed_batch_only_fails_its_own_files(self):
+        http = FakeBatchHttp(fail_calls={1})
+        failures = make_client(http).trash_files_batch(self.file_ids)
+
+        # Batches before and after the failed one still count as trashed
+        second_batch = self.file_ids[TRASH_BATCH_SIZE:TRASH_BATCH_SIZE * 2]
+        self.assertEqual(set(failures), set(second_batch))
+        self.assertEqual(http.calls, 3)
+
+
+class GetSyncStateTests(unittest.TestCase):
+    """DriveClient.get_sync_state() and incomplete batch replies."""
+
+    ABOUT = ("200 OK", '{"user": {"permissionId": "user1"}}')
+    TOKEN = ("200 OK", '{"startPageToken": "token1"}')
+
+    def test_both_parts_answered(self):
+        http = FakeSyncStateHttp({"about": self.ABOUT, "token": self.TOKEN})
+        self.assertEqual(make_client(http).get_sync_state(), ("user1", "token1"))
+
+    def test_missing_part_raises(self):
+        for parts in ({"about": self.ABOUT}, {"token": self.TOKEN}):
+            with self.subTest(parts=list(parts)):
+                with self.assertRaises(DriveClientError):
+                    make_client(FakeSyncStateHttp(parts)).get_sync_state()
+
+    def test_failed_part_raises(self):
+        http = FakeSyncStateHttp({"about": self.ABOUT, "token": ("404 Not Found", NOT_FOUND)})
+        with self.assertRaises(DriveClientError):
+            make_client(http).get_sync_state()
+
+    def test_missing_start_token_raises(self):
+        http = FakeSyncStateHttp({"about": self.ABOUT, "token": ("200 OK", "{}")})
+        with self.assertRaises(DriveClientError):
+            make_client(http).get_sync_state()
+
+
+class StreamDownloadTests(unittest.TestCase):
+    """Streaming a binary download with resume and cancellation."""
+
+    DATA = bytes(range(256)) * 4
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dest = Path(self._tmp.name) / "file.bin"
+        # The media URI comes from the discovery document; no request is made
+        self.client = make_client(FakeBatchHttp())
+        sleep = mock.patch("infra.drive_client.time.sleep")
+        sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_broken_transfer_resumes_with_range(self):
+        session = FakeSession(self.DATA, cut_after=400)
+        self.client._session = session
+
+        path = self.client.download_file(
+            "id", self.dest, "application/octet-stream",
+            expected_md5=hashlib.md5(self.DATA).hexdigest()
+        )
+
+        self.assertEqual(path.read_bytes(), self.DATA)
+        self.assertEqual(session.ranges, [None, "bytes=400-"])
+
+    def test_cancel_removes_partial_file(self):
+        self.client._session = FakeSession(self.DATA, cut_after=None)
+        calls = []
+
+        def cancel():
+            calls.append(None)
+            return len(calls) > 10
+
+        with self.assertRaises(DownloadCancelledError):
+            self.client.download_file("id", self.dest, "application/octet-stream",
+                                      cancel_callback=cancel)
+        self.assertFalse(self.dest.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
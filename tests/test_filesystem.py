@@ -0,0 +1,64 @@
+"""Tests for infra.filesystem."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from infra.filesystem import get_unique_path
+
+
+class GetUniquePathTests(unittest.TestCase):
+    """get_unique_path() with and without a reserved set."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_free_path_is_returned_unchanged(self):
+        path = self.root / "file.txt"
+        self.assertEqual(get_unique_path(path), path)
+
+    def test_existing_file_gets_a_number(self):
+        (self.root / "file.txt").touch()
+        self.assertEqual(get_unique_path(self.root / "file.txt"), self.root / "file (1).txt")
+
+    def test_numbers_skip_existing_copies(self):
+        for name in ("file.txt", "file (1).txt", "file (2).txt", "file (3).txt"):
+            (self.root / name).touch()
+        self.assertEqual(get_unique_path(self.root / "file.txt"), self.root / "file (4).txt")
+
+    def test_returned_path_is_reserved(self):
+        reserved = set()
+        path = get_unique_path(self.root / "file.txt", reserved)
+        self.assertEqual(reserved, {path})
+
+    def test_reserved_names_count_as_taken(self):
+        reserved = set()
+        paths = [get_unique_path(self.root / "file.txt", reserved) for _ in range(5)]
+
+        self.assertEqual(paths[0], self.root / "file.txt")
+        self.assertEqual(paths[1:], [self.root / f"file ({n}).txt" for n in range(1, 5)])
+        self.assertEqual(reserved, set(paths))
+        # Nothing is written; reservation alone keeps the names apart
+        self.assertEqual(list(self.root.iterdir()), [])
+
+    def test_reserved_and_existing_names_combine(self):
+        (self.root / "file.txt").touch()
+        reserved = {self.root / "file (1).txt"}
+        self.assertEqual(
+            get_unique_path(self.root / "file.txt", reserved),
+            self.root / "file (2).txt"
+        )
+
+    def test_names_differing_only_by_extension_are_separate(self):
+        reserved = set()
+        docx = get_unique_path(self.root / "Report.docx", reserved)
+        pdf = get_unique_path(self.root / "Report.pdf", reserved)
+        self.assertEqual((docx, pdf), (self.root / "Report.docx", self.root / "Report.pdf"))
+
+
+if __name__ == "__main__":
+    unittest.main()
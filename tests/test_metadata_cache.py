@@ -0,0 +1,175 @@
+"""Tests for storage.metadata_cache and applying Drive changes to it."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from storage.metadata_cache import MetadataCache
+from workers.scan_worker import ScanWorker
+
+
+def drive_file(file_id, size=1000, modified="2024-01-01T00:00:00.000Z", **extra):
+    """Build a Drive-style file metadata dictionary."""
+    data = {
+        "id": file_id,
+        "name": f"{file_id}.jpg",
+        "size": str(size),
+        "mimeType": "image/jpeg",
+        "modifiedTime": modified,
+        "parents": ["root"],
+    }
+    data.update(extra)
+    return data
+
+
+class FakeChangesClient:
+    """Serves prepared pages of Drive changes."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.tokens = []
+
+    def iter_change_pages(self, page_token, cancel_callback=None):
+        self.tokens.append(page_token)
+        yield from self.pages
+
+
+class MetadataCacheTests(unittest.TestCase):
+    """Storing, committing and reading back the mirror."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "metadata.db"
+        self.cache = MetadataCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        self._tmp.cleanup()
+
+    def ids(self, cache=None):
+        cache = cache or self.cache
+        return [f["id"] for page in cache.iter_file_pages() for f in page]
+
+    def test_files_come_back_newest_first_in_drive_shape(self):
+        self.cache.upsert([
+            drive_file("old", modified="2020-01-01T00:00:00.000Z"),
+            drive_file("new", size=5, modified="2024-06-01T00:00:00.000Z", md5Checksum="abc"),
+        ])
+
+        pages = list(self.cache.iter_file_pages())
+        self.assertEqual([f["id"] for f in pages[0]], ["new", "old"])
+        self.assertEqual(pages[0][0], {
+            "id": "new",
+            "name": "new.jpg",
+            "size": 5,
+            "mimeType": "image/jpeg",
+            "modifiedTime": "2024-06-01T00:00:00.000Z",
+            "parents": ["root"],
+            "md5Checksum": "abc",
+        })
+        self.assertNotIn("md5Checksum", pages[0][1])
+
+    def test_pages_respect_page_size(self):
+        self.cache.upsert([drive_file(f"f{i}") for i in range(5)])
+        self.assertEqual([len(p) for p in self.cache.iter_file_pages(page_size=2)], [2, 2, 1])
+
+    def test_page_token_is_per_account(self):
+        self.cache.commit("user1", "token1")
+        self.assertEqual(self.cache.get_page_token("user1"), "token1")
+        self.assertIsNone(self.cache.get_page_token("user2"))
+
+    def test_uncommitted_changes_are_not_kept(self):
+        self.cache.upsert([drive_file("a")])
+        self.cache.commit("user1", "token1")
+
+        self.cache.upsert([drive_file("b")])
+        self.cache.remove(["a"])
+        self.cache.close()
+
+        self.cache = MetadataCache(self.path)
+        self.assertEqual(self.ids(), ["a"])
+
+    def test_rollback_restores_the_committed_state(self):
+        self.cache.upsert([drive_file("a")])
+        self.cache.commit("user1", "token1")
+
+        self.cache.clear()
+        self.cache.rollback()
+
+        self.assertEqual(self.ids(), ["a"])
+        self.assertEqual(self.cache.get_page_token("user1"), "token1")
+
+
+class ApplyChangesTests(unittest.TestCase):
+    """ScanWorker._apply_changes() keeping the mirror in step with Drive."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = MetadataCache(Path(self._tmp.name) / "metadata.db")
+        self.cache.upsert([drive_file("keep"), drive_file("edit", size=10), drive_file("gone")])
+        self.cache.commit("user1", "token1")
+        self.worker = ScanWorker(min_size_mb=0)
+
+    def tearDown(self):
+        self.cache.close()
+        self._tmp.cleanup()
+
+    def mirrored(self):
+        return {f["id"]: f for page in self.cache.iter_file_pages() for f in page}
+
+    def test_changes_update_insert_and_remove_files(self):
+        client = FakeChangesClient([
+            ([
+                {"fileId": "edit", "file": drive_file("edit", size=99, trashed=False, ownedByMe=True)},
+                {"fileId": "added", "file": drive_file("added", trashed=False, ownedByMe=True)},
+            ], None),
+            ([
+                {"fileId": "gone", "removed": True},
+            ], "token2"),
+        ])
+
+        token = self.worker._apply_changes(client, self.cache, "token1")
+
+        self.assertEqual(token, "token2")
+        self.assertEqual(client.tokens, ["token1"])
+        files = self.mirrored()
+        self.assertEqual(set(files), {"keep", "edit", "added"})
+        self.assertEqual(files["edit"]["size"], 99)
+
+    def test_trashed_unowned_and_skipped_files_leave_the_mirror(self):
+        client = FakeChangesClient([([
+            {"fileId": "keep", "file": drive_file("keep", trashed=True, ownedByMe=True)},
+            {"fileId": "edit", "file": drive_file("edit", trashed=False, ownedByMe=False)},
+            {"fileId": "gone", "file": drive_file(
+                "gone", mimeType="application/vnd.google-apps.folder", trashed=False, ownedByMe=True
+            )},
+        ], "token2")])
+
+        self.worker._apply_changes(client, self.cache, "token1")
+
+        self.assertEqual(self.mirrored(), {})
+
+    def test_file_without_ownership_is_treated_as_unowned(self):
+        client = FakeChangesClient([([
+            {"fileId": "edit", "file": drive_file("edit", size=99, trashed=False)},
+        ], "token2")])
+
+        self.worker._apply_changes(client, self.cache, "token1")
+
+        self.assertEqual(set(self.mirrored()), {"keep", "gone"})
+
+    def test_removing_unknown_files_is_harmless(self):
+        client = FakeChangesClient([([{"fileId": "never-seen", "removed": True}], "token2")])
+
+        self.assertEqual(self.worker._apply_changes(client, self.cache, "token1"), "token2")
+        self.assertEqual(set(self.mirrored()), {"keep", "edit", "gone"})
+
+    def test_cancelled_sync_returns_no_token(self):
+        client = FakeChangesClient([([{"fileId": "gone", "removed": True}], "token2")])
+        self.worker.cancel()
+
+        self.assertIsNone(self.worker._apply_changes(client, self.cache, "token1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""Tests for core.organizer."""
+
+import unittest
+from datetime import datetime
+
+from core.organizer import parse_drive_date
+
+
+class ParseDriveDateTests(unittest.TestCase):
+    """parse_drive_date() on the RFC 3339 timestamps Drive returns."""
+
+    def test_milliseconds_and_z_suffix(self):
+        self.assertEqual(
+            parse_drive_date("2024-01-15T10:30:00.123Z"),
+            datetime(2024, 1, 15, 10, 30, 0, 123000)
+        )
+
+    def test_without_fraction(self):
+        self.assertEqual(
+            parse_drive_date("2024-01-15T10:30:05Z"),
+            datetime(2024, 1, 15, 10, 30, 5)
+        )
+
+    def test_without_z_suffix(self):
+        self.assertEqual(
+            parse_drive_date("2024-01-15T10:30:05"),
+            datetime(2024, 1, 15, 10, 30, 5)
+        )
+
+    def test_microseconds(self):
+        self.assertEqual(
+            parse_drive_date("2024-01-15T10:30:05.000007Z"),
+            datetime(2024, 1, 15, 10, 30, 5, 7)
+        )
+
+    def test_empty_string(self):
+        self.assertIsNone(parse_drive_date(""))
+
+    def test_malformed_strings(self):
+        for date_str in (
+            "2024-01-15",
+            "2024/01/15T10:30:00Z",
+            "2024-01-15 10:30:00Z",
+            "2024-01-15T10:30:00,123Z",
+            "2024-01-15T10:30:00.1234567Z",
+            "2024-01-15T10:30:00.abcZ",
+            "not a date at all!",
+        ):
+            with self.subTest(date_str=date_str):
+                self.assertIsNone(parse_drive_date(date_str))
+
+    def test_out_of_range_fields(self):
+        for date_str in ("2024-13-01T00:00:00Z", "2024-02-30T00:00:00Z", "2024-01-01T25:00:00Z"):
+            with self.subTest(date_str=date_str):
+                self.assertIsNone(parse_drive_date(date_str))
+
+
+if __name__ == "__main__":
+    unittest.main()
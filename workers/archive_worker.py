@@ -1,24 +1,38 @@
 """Background worker for archiving files from Google Drive."""
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple
 
 from PySide6.QtCore import QObject, QRunnable, Signal, Slot
 
-from infra.drive_client import DriveClient, DriveClientError
+from infra.auth import get_credentials, CredentialsMissingError
+from infra.drive_client import (
+    DriveClient, DriveClientError, DownloadCancelledError, GOOGLE_DOC_EXPORTS
+)
 from infra.filesystem import verify_download, get_unique_path, clean_filename
-from core.organizer import get_local_path, parse_drive_date
+from core.organizer import get_local_path, parse_drive_date, ensure_structure
 from core.planner import FileInfo
 
 
+# Downloads are network-bound, so a few in flight hide per-request latency
+MAX_PARALLEL_DOWNLOADS = 8
+
+# Minimum seconds between bytes_progress signals (about 30 per second)
+BYTES_PROGRESS_INTERVAL = 1 / 30
+
+
 class ArchiveWorkerSignals(QObject):
     """Signals for the archive worker."""
 
     # Emitted with (current_index, total_count, filename)
     progress = Signal(int, int, str)
 
-    # Emitted with (bytes_downloaded, total_bytes) for current file
-    file_progress = Signal(int, int)
+    # Emitted with (bytes_downloaded, total_bytes) summed over every file in
+    # the run, since several files download at once
+    bytes_progress = Signal("qint64", "qint64")
 
     # Emitted when archive completes with (success_count, fail_count)
     finished = Signal(int, int)
@@ -38,7 +52,9 @@ class ArchiveWorker(QRunnable):
     Background worker for downloading and archiving files.
 
     Downloads files to the local archive, verifies downloads,
-    and optionally moves originals to Trash.
+    and optionally moves originals to Trash. Several files are downloaded
+    at once; each download thread uses its own DriveClient, since the
+    underlying API service object is not thread-safe.
     """
 
     def __init__(
@@ -46,7 +62,8 @@ class ArchiveWorker(QRunnable):
         files: List[Dict[str, Any]],
         archive_path: str,
         dry_run: bool = True,
-        trash_after: bool = True
+        trash_after: bool = True,
+        max_workers: int = MAX_PARALLEL_DOWNLOADS
     ):
         """
         Initialize the archive worker.
@@ -56,14 +73,30 @@ class ArchiveWorker(QRunnable):
             archive_path: Local archive root directory
             dry_run: If True, only simulate actions
             trash_after: If True, move originals to Trash after download
+            max_workers: Maximum number of files downloaded at once
         """
         super().__init__()
         self.files = [FileInfo(f) for f in files]
         self.archive_path = Path(archive_path)
         self.dry_run = dry_run
         self.trash_after = trash_after
+        self.max_workers = max(1, max_workers)
         self.signals = ArchiveWorkerSignals()
         self._cancelled = False
+        self._credentials = None
+        self._thread_local = threading.local()
+
+        # Bytes downloaded so far, per file ID and in total, shared by the
+        # download threads under _progress_lock
+        self._progress_lock = threading.Lock()
+        self._file_bytes: Dict[str, int] = {}
+        self._bytes_done = 0
+        self._bytes_total = sum(f.size for f in self.files)
+        self._last_bytes_progress = 0.0
+
+        # Downloaded files awaiting the batched trash step: (file_info, local path)
+        self._to_trash: List[Tuple[FileInfo, Path]] = []
+        self._to_trash_lock = threading.Lock()
 
     def cancel(self) -> None:
         """Request cancellation of the archive operation."""
@@ -74,36 +107,81 @@ class ArchiveWorker(QRunnable):
         """Execute the archive operation."""
         success_count = 0
         fail_count = 0
+        completed = 0
         total = len(self.files)
 
         try:
             if not self.dry_run:
                 self.signals.status.emit("Connecting to Google Drive...")
-                client = DriveClient()
+                self._credentials = get_credentials()
+                if self._credentials is None:
+                    raise CredentialsMissingError()
             else:
-                client = None
                 self.signals.status.emit("Dry run - simulating archive...")
 
-            for i, file_info in enumerate(self.files):
-                if self._cancelled:
-                    self.signals.status.emit("Archive cancelled")
-                    break
+            # Plan every destination first so shared folders are created once
+            planned_paths = [self._plan_local_path(f) for f in self.files]
+            if not self.dry_run:
+                ensure_structure(planned_paths)
+
+            # Parallel downloads can't see each other's files on disk yet,
+            # so claim unique names for the whole batch up front
+            reserved: Set[Path] = set()
+            dest_paths = [get_unique_path(path, reserved) for path in planned_paths]
 
-                self.signals.progress.emit(i + 1, total, file_info.name)
+            # A dry run does no I/O; one thread keeps its log in file order
+            max_workers = 1 if self.dry_run else self.max_workers
+            if not self.dry_run:
+                self.signals.status.emit(f"Downloading {total} files...")
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self._run_task, file_info, dest_path): file_info
+                    for file_info, dest_path in zip(self.files, dest_paths)
+                }
+
+                for future in as_completed(futures):
+                    file_info = futures[future]
+
+                    if self._cancelled:
+                        # Drop queued files; ones already downloading stop at their next chunk
+                        for pending in futures:
+                            pending.cancel()
+
+                    if future.cancelled():
+                        continue
+
+                    try:
+                        success = future.result()
+                    except Exception as e:
+                        success = False
+                        self.signals.file_result.emit(
+                            file_info.name,
+                            False,
+                            f"Error: {e}"
+                        )
+
+                    # None means the task saw the cancel request and skipped the file
+                    if success is None:
+                        continue
+
+                    completed += 1
+                    self.signals.progress.emit(completed, total, file_info.name)
 
-                try:
-                    success = self._process_file(client, file_info)
                     if success:
                         success_count += 1
                     else:
                         fail_count += 1
-                except Exception as e:
-                    fail_count += 1
-                    self.signals.file_result.emit(
-                        file_info.name,
-                        False,
-                        f"Error: {e}"
-                    )
+
+            if self._cancelled:
+                self.signals.status.emit("Archive cancelled")
+
+            # Files that finished downloading are trashed even after a cancel,
+            # as they would have been when each was trashed right away
+            if self._to_trash:
+                trash_failures = self._trash_downloaded()
+                success_count -= trash_failures
+                fail_count += trash_failures
 
             mode = "Dry run" if self.dry_run else "Archive"
             self.signals.status.emit(
@@ -116,27 +194,96 @@ class ArchiveWorker(QRunnable):
         except Exception as e:
             self.signals.error.emit(f"Archive failed: {e}")
 
-    def _process_file(self, client: DriveClient, file_info: FileInfo) -> bool:
+    def _trash_downloaded(self) -> int:
         """
-        Process a single file.
+        Move the downloaded originals to Trash in batches and report each result.
+
+        Returns:
+            Number of files that could not be trashed
+        """
+        self.signals.status.emit(f"Moving {len(self._to_trash)} files to trash...")
+        client = self._get_client()
+
+        failures = client.trash_files_batch([f.id for f, _ in self._to_trash])
+
+        for file_info, actual_path in self._to_trash:
+            error = failures.get(file_info.id)
+            if error:
+                self.signals.file_result.emit(
+                    file_info.name,
+                    False,
+                    f"Downloaded to {actual_path}, but could not move to trash: {error}"
+                )
+            else:
+                self.signals.file_result.emit(
+                    file_info.name,
+                    True,
+                    f"Downloaded and trashed to {actual_path}"
+                )
+
+        return len(failures)
+
+    def _get_client(self) -> DriveClient:
+        """Get the calling thread's DriveClient, creating it on first use."""
+        client = getattr(self._thread_local, "client", None)
+        if client is None:
+            client = DriveClient(credentials=self._credentials)
+            self._thread_local.client = client
+        return client
+
+    def _run_task(self, file_info: FileInfo, local_path: Path) -> Optional[bool]:
+        """
+        Process one file on a download thread.
 
         Returns:
-            True if successful
+            True if successful, False if failed, None if skipped due to cancellation
+        """
+        if self._cancelled:
+            return None
+
+        client = None if self.dry_run else self._get_client()
+        return self._process_file(client, file_info, local_path)
+
+    def _plan_local_path(self, file_info: FileInfo) -> Path:
+        """
+        Determine where a file belongs in the local archive.
+
+        Google Docs get their export extension here, so the name reserved
+        for them is the one actually written (download_file() keeps a
+        matching suffix as-is).
         """
-        # Determine local path
         modified_date = parse_drive_date(file_info.modified_time)
         clean_name = clean_filename(file_info.name)
 
-        local_path = get_local_path(
+        path = get_local_path(
             archive_root=self.archive_path,
             filename=clean_name,
             mime_type=file_info.mime_type,
             modified_date=modified_date
         )
 
-        # Get unique path if file exists
-        local_path = get_unique_path(local_path)
+        export = GOOGLE_DOC_EXPORTS.get(file_info.mime_type)
+        if export and path.suffix != export[1]:
+            path = path.with_name(path.name + export[1])
+        return path
+
+    def _process_file(
+        self,
+        client: DriveClient,
+        file_info: FileInfo,
+        local_path: Path
+    ) -> Optional[bool]:
+        """
+        Process a single file.
+
+        Args:
+            client: Drive client (None during a dry run)
+            file_info: The file to process
+            local_path: Unique destination, whose folder already exists
 
+        Returns:
+            True if successful, False if failed, None if cancelled mid-download
+        """
         if self.dry_run:
             # Simulate the operation
             action = "Would download"
@@ -150,15 +297,16 @@ class ArchiveWorker(QRunnable):
             )
             return True
 
-        # Download the file
-        self.signals.status.emit(f"Downloading: {file_info.name}")
-
+        # Download the file (per-file status would interleave between
+        # threads; progress is reported as each file completes instead)
         try:
             actual_path = client.download_file(
                 file_id=file_info.id,
                 dest_path=local_path,
                 mime_type=file_info.mime_type,
-                progress_callback=self._on_file_progress
+                progress_callback=lambda done, _total: self._on_file_progress(file_info.id, done),
+                expected_md5=file_info.md5_checksum,
+                cancel_callback=self._is_cancelled
             )
 
             # Verify download (skip size check for Google Docs as they export differently)
@@ -173,22 +321,21 @@ class ArchiveWorker(QRunnable):
                 )
                 return False
 
-            # Trash the original if enabled
+            # Trashing is batched after all downloads; the result is reported then
             if self.trash_after:
-                self.signals.status.emit(f"Moving to trash: {file_info.name}")
-                client.trash_file(file_info.id)
-
-            action = "Downloaded"
-            if self.trash_after:
-                action += " and trashed"
+                with self._to_trash_lock:
+                    self._to_trash.append((file_info, actual_path))
+                return True
 
             self.signals.file_result.emit(
                 file_info.name,
                 True,
-                f"{action} to {actual_path}"
+                f"Downloaded to {actual_path}"
             )
             return True
 
+        except DownloadCancelledError:
+            return None
         except DriveClientError as e:
             self.signals.file_result.emit(
                 file_info.name,
@@ -197,6 +344,30 @@ class ArchiveWorker(QRunnable):
             )
             return False
 
-    def _on_file_progress(self, downloaded: int, total: int) -> None:
-        """Handle download progress for current file."""
-        self.signals.file_progress.emit(downloaded, total)
+    def _is_cancelled(self) -> bool:
+        """Tell downloads in flight whether to stop."""
+        return self._cancelled
+
+    def _on_file_progress(self, file_id: str, downloaded: int) -> None:
+        """
+        Add one file's download progress to the run total and report it.
+
+        Called from download threads. Emits are throttled across all of
+        them; reaching the total always emits.
+        """
+        with self._progress_lock:
+            # A restarted download reports fewer bytes than before
+            self._bytes_done += downloaded - self._file_bytes.get(file_id, 0)
+            self._file_bytes[file_id] = downloaded
+
+            # Google Docs list as 0 bytes but export to real files
+            total = max(self._bytes_total, self._bytes_done)
+
+            now = time.monotonic()
+            if (
+                self._bytes_done != total
+                and now - self._last_bytes_progress < BYTES_PROGRESS_INTERVAL
+            ):
+                return
+            self._last_bytes_progress = now
+            self.signals.bytes_progress.emit(self._bytes_done, total)
@@ -0,0 +1,58 @@
+"""Background worker for refreshing the connected account credentials and email."""
+
+from PySide6.QtCore import QObject, QRunnable, Signal, Slot
+
+
+class EmailRefreshWorkerSignals(QObject):
+    """Signals for the email refresh worker."""
+
+    # Emitted with the account email fetched from Google
+    fetched = Signal(str)
+
+    # Emitted with an error message when Google rejects the saved token
+    auth_failed = Signal(str)
+
+
+class EmailRefreshWorker(QRunnable):
+    """
+    Background worker for refreshing the account at startup.
+
+    Loads saved credentials (refreshing the token if needed) and, unless
+    the email is already known, asks the Drive API for the user's email,
+    without blocking the UI thread.
+    """
+
+    def __init__(self, fetch_email: bool = True):
+        """
+        Initialize the email refresh worker.
+
+        Args:
+            fetch_email: If False, only refresh the saved token
+        """
+        super().__init__()
+        self.fetch_email = fetch_email
+        self.signals = EmailRefreshWorkerSignals()
+
+    @Slot()
+    def run(self) -> None:
+        """
+        Refresh credentials and fetch the account email.
+
+        Emits auth_failed if Google rejects the saved token; otherwise
+        emits nothing when the email can't be determined.
+        """
+        from infra.auth import load_credentials, get_user_email, TokenRejectedError
+
+        try:
+            creds = load_credentials()
+        except TokenRejectedError as e:
+            self.signals.auth_failed.emit(str(e))
+            return
+
+        try:
+            if creds and self.fetch_email:
+                email = get_user_email(creds)
+                if email and email != "Unknown":
+                    self.signals.fetched.emit(email)
+        except Exception:
+            pass
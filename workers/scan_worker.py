@@ -1,21 +1,35 @@
 """Background worker for scanning Google Drive files."""
 
-from typing import List
+import time
+from typing import List, Dict, Any, Optional
 
 from PySide6.QtCore import QObject, QRunnable, Signal, Slot
 
 from infra.drive_client import DriveClient, DriveClientError
-from core.planner import FileInfo, filter_eligible_files
+from storage.metadata_cache import MetadataCache
+from core.planner import SKIP_MIME_TYPES, filter_eligible_files
+from core.classifier import classify_file
+
+
+# Minimum seconds between progress signals (about 30 per second)
+PROGRESS_INTERVAL = 1 / 30
 
 
 class ScanWorkerSignals(QObject):
     """Signals for the scan worker."""
 
-    # Emitted with count of files found so far
+    # Emitted with count of eligible files found so far
     progress = Signal(int)
 
-    # Emitted when scan completes successfully with list of eligible files
-    finished = Signal(list)
+    # Emitted with eligible files as they are found, in batches
+    batch = Signal(list)
+
+    # Emitted when scan completes successfully with
+    # (eligible files, total size in bytes, file count)
+    finished = Signal(list, "qint64", int)
+
+    # Emitted when the scan stops early because it was cancelled
+    cancelled = Signal()
 
     # Emitted on error with error message
     error = Signal(str)
@@ -29,9 +43,16 @@ class ScanWorker(QRunnable):
     Background worker for scanning Google Drive.
 
     Scans Drive for files meeting the size threshold and emits
-    progress updates during the scan.
+    progress updates and batches of eligible files during the scan.
+
+    The Drive listing is mirrored in a local MetadataCache. The first scan
+    lists every file; later scans only fetch what changed since the last
+    one and read the rest from the mirror.
     """
 
+    # Number of eligible files collected before a batch is emitted
+    BATCH_SIZE = 200
+
     def __init__(self, min_size_mb: int, before_date: str = ""):
         """
         Initialize the scan worker.
@@ -45,11 +66,20 @@ class ScanWorker(QRunnable):
         self.before_date = before_date
         self.signals = ScanWorkerSignals()
         self._cancelled = False
+        # Eligible files, already in the dict form the signals carry
+        self._eligible: List[Dict[str, Any]] = []
+        self._total_size = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._last_progress = 0.0
 
     def cancel(self) -> None:
         """Request cancellation of the scan."""
         self._cancelled = True
 
+    def _is_cancelled(self) -> bool:
+        """Check whether cancellation was requested (polled between pages)."""
+        return self._cancelled
+
     @Slot()
     def run(self) -> None:
         """Execute the scan operation."""
@@ -57,42 +87,173 @@ class ScanWorker(QRunnable):
             self.signals.status.emit("Connecting to Google Drive...")
 
             client = DriveClient()
+            cache = MetadataCache()
 
-            self.signals.status.emit("Scanning files...")
-
-            # Fetch files with progress updates
-            files = client.list_files(
-                min_size_mb=self.min_size_mb,
-                before_date=self.before_date,
-                progress_callback=self._on_progress
-            )
+            try:
+                self._scan(client, cache)
+            finally:
+                cache.close()
 
             if self._cancelled:
                 self.signals.status.emit("Scan cancelled")
+                self.signals.cancelled.emit()
                 return
 
-            self.signals.status.emit("Filtering eligible files...")
+            self._flush_batch()
+            # Progress is throttled, so make sure the final count is shown
+            self.signals.progress.emit(len(self._eligible))
 
-            # Filter to eligible files
-            eligible = filter_eligible_files(
-                files,
-                min_size_mb=self.min_size_mb,
-                before_date=self.before_date,
-                include_google_docs=True
-            )
-
-            # Convert to serializable format for signal
-            result = [f.to_dict() for f in eligible]
+            # Totalled as pages arrive, so neither thread walks the list again
+            result = self._eligible
 
             self.signals.status.emit(f"Found {len(result)} files")
-            self.signals.finished.emit(result)
+            self.signals.finished.emit(result, self._total_size, len(result))
 
         except DriveClientError as e:
             self.signals.error.emit(str(e))
         except Exception as e:
             self.signals.error.emit(f"Scan failed: {e}")
 
+    def _scan(self, client: DriveClient, cache: MetadataCache) -> None:
+        """Bring the metadata mirror up to date and filter eligible files from it."""
+        # The start token is only used by a full scan, but fetching it in the
+        # same batch call as the user ID costs no extra round-trip
+        user_id, start_token = client.get_sync_state()
+        page_token = cache.get_page_token(user_id)
+
+        if page_token is not None:
+            self.signals.status.emit("Checking for changes...")
+            try:
+                new_token = self._apply_changes(client, cache, page_token)
+            except DriveClientError:
+                # The token may have expired; start over with a full listing
+                cache.rollback()
+                new_token = None
+
+            if new_token is not None:
+                cache.commit(user_id, new_token)
+
+                self.signals.status.emit("Scanning files...")
+                for page_files in cache.iter_file_pages():
+                    if self._cancelled:
+                        return
+                    self._on_page(page_files)
+                    self._on_progress(len(self._eligible))
+                return
+
+            if self._cancelled:
+                return
+
+        self._scan_full(client, cache, user_id, start_token)
+
+    def _apply_changes(self, client: DriveClient, cache: MetadataCache, page_token: str) -> Optional[str]:
+        """
+        Apply the Drive changes since page_token to the mirror (uncommitted).
+
+        Returns:
+            Token to sync from next time, or None if cancelled
+        """
+        new_token = None
+
+        for changes, start_token in client.iter_change_pages(
+            page_token,
+            cancel_callback=self._is_cancelled
+        ):
+            updated = []
+            removed = []
+            for change in changes:
+                file_data = change.get("file")
+                if (
+                    change.get("removed") or not file_data
+                    or file_data.get("trashed") or not file_data.get("ownedByMe", False)
+                    or file_data.get("mimeType") in SKIP_MIME_TYPES
+                ):
+                    removed.append(change["fileId"])
+                else:
+                    updated.append(file_data)
+
+            cache.remove(removed)
+            cache.upsert(updated)
+            new_token = start_token or new_token
+
+        return None if self._cancelled else new_token
+
+    def _scan_full(
+        self,
+        client: DriveClient,
+        cache: MetadataCache,
+        user_id: str,
+        start_token: str
+    ) -> None:
+        """
+        List the whole Drive into a fresh mirror, filtering pages as they arrive.
+
+        start_token must be taken before listing, so changes made during
+        the listing are picked up by the next sync.
+        """
+        self.signals.status.emit("Scanning files...")
+        cache.clear()
+
+        # Trade-off: later scans sync the mirror incrementally and may use a
+        # different cutoff, so it must hold every file. A first scan in date
+        # mode therefore lists the whole Drive instead of filtering on
+        # modifiedTime server side; _on_page applies this scan's rules
+        for page_files in client.iter_file_pages(
+            cancel_callback=self._is_cancelled,
+            exclude_mime_types=SKIP_MIME_TYPES
+        ):
+            cache.upsert(page_files)
+            self._on_page(page_files)
+            self._on_progress(len(self._eligible))
+
+        if self._cancelled:
+            cache.rollback()
+        else:
+            cache.commit(user_id, start_token)
+
+    def _on_page(self, files: List[Dict[str, Any]]) -> None:
+        """
+        Filter a page of files and queue eligible ones for the UI.
+
+        Both the Drive listing and the mirror deliver unfiltered pages, so
+        the planner's rules are the only place eligibility is decided.
+        """
+        if self._cancelled:
+            return
+
+        # Google Docs list as 0 bytes, so a size threshold can't be
+        # judged for them; they are only included when there is none
+        eligible = filter_eligible_files(
+            files,
+            min_size_mb=self.min_size_mb,
+            before_date=self.before_date,
+            include_google_docs=self.min_size_mb == 0
+        )
+
+        # Normalize once here so the UI thread only reads ready-made values
+        for f in eligible:
+            file_data = f.to_dict()
+            file_data["size"] = f.size
+            file_data["_category"] = classify_file(f.name, f.mime_type)
+            self._eligible.append(file_data)
+            self._pending.append(file_data)
+            self._total_size += f.size
+
+        if len(self._pending) >= self.BATCH_SIZE:
+            self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        """Emit any queued eligible files."""
+        if self._pending:
+            self.signals.batch.emit(self._pending)
+            self._pending = []
+
     def _on_progress(self, count: int) -> None:
-        """Handle progress update from API."""
-        if not self._cancelled:
-            self.signals.progress.emit(count)
+        """Handle progress update from API (throttled; run() emits the final count)."""
+        if self._cancelled:
+            return
+        now = time.monotonic()
+        if now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        self.signals.progress.emit(count)